@@ -1,30 +1,34 @@
 import streamlit as st
-from canvas_logic import CanvasManager, DownloadError
+from canvas_logic import DownloadError
 import asyncio
 import collections
+import hashlib
+import json
 import os
 import logging
-import sys
 import time
+import types
 from datetime import datetime
 
 import theme
-import version
 
 logger = logging.getLogger(__name__)
 from pathlib import Path
 from sync_ui import render_sync_step1, render_sync_step4
-from ui_helpers import esc, render_download_wizard
+from ui_helpers import esc, render_download_wizard, get_config_dir
 from ui_shared import (
     render_completion_card, render_folder_cards,
     render_error_section, render_pp_warning, SECONDARY_ENTITY_ICONS,
     error_log_dialog,
 )
 from styles import inject_css
+from ui.auth import render_sidebar
 from core.state_registry import (
-    ensure_download_state,
+    ensure_download_state, cleanup_download_state,
 )
+from sync_manager import secondary_id_type
 from core.cancellation import cancel_download, is_download_cancelled
+from canvas_debug import flush_debug_log
 from engine.progress_dashboard import DashboardPlaceholders, render_full_dashboard
 from engine.post_processing_bridge import invoke_post_processing, build_conversion_contract
 
@@ -57,18 +61,24 @@ ensure_download_state()
 
 # --- Helper Functions ---
 
-def select_folder():
+# Extensions kept by the 'study' file filter (no leading dot — compared
+# against rpartition('.') output). Frozenset for O(1) membership in the
+# per-file scan loop.
+_STUDY_EXTS = frozenset({'pdf', 'ppt', 'pptx', 'pptm', 'pot', 'potx'})
+
+def _pick_folder(state_key):
+    """Run the native folder picker and store the result under ``state_key``."""
     from ui_helpers import native_folder_picker
     folder_path = native_folder_picker()
     if folder_path:
-        st.session_state['download_path'] = folder_path
+        st.session_state[state_key] = folder_path
+
+def select_folder():
+    _pick_folder('download_path')
 
 def select_sync_folder():
     """Open folder picker for sync mode and store in pending_sync_folder."""
-    from ui_helpers import native_folder_picker
-    folder_path = native_folder_picker()
-    if folder_path:
-        st.session_state['pending_sync_folder'] = folder_path
+    _pick_folder('pending_sync_folder')
 
 def check_cancellation():
     """Backward-compatible alias for is_download_cancelled (used by canvas_logic.py)."""
@@ -80,26 +90,128 @@ def cancel_download_callback():
 
 
 
+# Shared cached CanvasManager factory (also used by the sync flow)
+from core.managers import get_manager
+
+
+# On-disk course snapshot — canvasapi Course objects aren't reliably
+# picklable, so Streamlit's persist="disk" can't cache them directly.
+# Instead each real fetch writes a slim JSON snapshot (per-credential file,
+# keyed by a token fingerprint) that serves step 1 instantly on the next
+# app start while the full objects are re-fetched only when downloading.
+_COURSES_SNAPSHOT_TTL = 3600
+
+
+def _courses_snapshot_path(token, url):
+    key = hashlib.sha256(f"{token}|{url}".encode('utf-8')).hexdigest()[:16]
+    return Path(get_config_dir()) / f'courses_{key}.json'
+
+
 @st.cache_data(ttl=600)  # 10-minute TTL — new courses appear after brief wait
-def fetch_courses(token, url, fav_only):
-    mgr = CanvasManager(token, url)
+def _fetch_all_courses(token, url):
+    mgr = get_manager(token, url)
+    courses = list(mgr.get_courses(False))
+    # Global Alphabetical Sort — the lowercased key is stashed on each
+    # course so downstream per-rerun sorts reuse it instead of calling
+    # .lower() on every name again.
+    for c in courses:
+        c._name_lower = (c.name or "").lower()
+    courses.sort(key=lambda c: c._name_lower)
+
+    # Best-effort snapshot write — course listing works fine without it
     try:
-        courses = list(mgr.get_courses(fav_only))
-        # Global Alphabetical Sort
-        courses.sort(key=lambda c: (c.name or "").lower())
+        snap = [
+            {
+                'id': c.id,
+                'name': c.name,
+                'is_favorite': bool(getattr(c, 'is_favorite', False)),
+                # Display fields — get_course_display_parts prefers the
+                # friendly_name nickname and renders course_code as subtext,
+                # so snapshot-served cold starts must carry both.
+                'course_code': getattr(c, 'course_code', '') or '',
+                'friendly_name': getattr(c, 'friendly_name', '') or '',
+            }
+            for c in courses
+        ]
+        with open(_courses_snapshot_path(token, url), 'w', encoding='utf-8') as f:
+            json.dump({'ts': time.time(), 'courses': snap}, f)
+    except Exception:
+        pass
+    return courses
+
+
+@st.cache_data(ttl=600)
+def _load_courses_snapshot(token, url):
+    """Return the on-disk course list (None if absent or stale)."""
+    try:
+        with open(_courses_snapshot_path(token, url), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if time.time() - data.get('ts', 0) > _COURSES_SNAPSHOT_TTL:
+            return None
+        courses = [types.SimpleNamespace(**c) for c in data['courses']]
+        for c in courses:
+            c._name_lower = (c.name or "").lower()
+        return courses
+    except Exception:
+        return None
+
+
+@st.cache_data(ttl=600)
+def _fetch_favorite_ids(token, url):
+    """Fallback favorites lookup for Canvas instances that omit is_favorite."""
+    mgr = get_manager(token, url)
+    return {c.id for c in mgr.get_courses(True)}
+
+
+@st.cache_data(ttl=600)
+def fetch_courses(token, url, fav_only):
+    # One full fetch serves BOTH toggle positions: favorites are derived
+    # client-side instead of paying a second courses API roundtrip.
+    # Cold start is served from the on-disk snapshot when fresh — the
+    # selector needs the identity and display fields, not live Course objects.
+    courses = _load_courses_snapshot(token, url)
+    if courses is None:
+        courses = _fetch_all_courses(token, url)
+    if not fav_only:
         return courses
-    except Exception as e:
-        # If fetching fails (e.g. auth error), return empty list or let UI handle it. 
-        # But mgr.get_courses already raises exception. We should probably let it propagate or return empty.
-        # Existing code expected it to raise or return iterable. 
-        # Since we wrapper it, let's just let it raise if mgr.get_courses raises.
-        # But we need to handle the list conversion safely if it returns None (unlikely).
-        raise e
+    favorites = [c for c in courses if getattr(c, 'is_favorite', False)]
+    if favorites:
+        return favorites
+    fav_ids = _fetch_favorite_ids(token, url)
+    return [c for c in courses if c.id in fav_ids]
+
+
+def _rehydrate_courses(metas):
+    """Resolve slim {'id', 'name'} course metadata back into Course objects.
+
+    Session state stores only id/name pairs (full canvasapi objects are
+    heavyweight and get pickled with session state on every rerun); the
+    real objects come from the cached course list. Legacy full objects
+    pass through untouched.
+    """
+    by_id = {c.id: c for c in _fetch_all_courses(st.session_state['api_token'], st.session_state['api_url'])}
+    resolved = []
+    missing = []
+    for m in metas:
+        if isinstance(m, dict):
+            course = by_id.get(m['id'])
+            if course is not None:
+                resolved.append(course)
+            else:
+                missing.append(m)
+        else:
+            resolved.append(m)
+    if missing:
+        # A selected course vanished from the (10-minute-cached) listing —
+        # dropping it silently would shrink the queue and shift indices out
+        # from under the persisted progress, so tell the user what was lost.
+        names = ", ".join(str(m.get('name') or m.get('id')) for m in missing)
+        st.warning(f"⚠️ Skipping {len(missing)} selected course(s) no longer in your course list: {names}")
+    return resolved
 
 # --- Sidebar: Authentication (delegated to ui.auth) ---
 with st.sidebar:
-    from ui.auth import render_sidebar
-    render_sidebar(fetch_courses)
+    render_sidebar(fetch_courses, get_manager)
 
 
 
@@ -207,117 +319,160 @@ with _main_content.container():
                 on_click=cancel_download_callback,
             )
             
-            cm = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
+            cm = get_manager(st.session_state['api_token'], st.session_state['api_url'])
             total_items = 0
             total_mb = 0
-            
-            for idx, course in enumerate(st.session_state['courses_to_download']):
-                # Check if the user clicked the global cancel button before processing the next course
-                if st.session_state.get('cancel_requested', False):
-                    break # Escape the loop immediately!
-                    
-                current_course_num = idx + 1
-                percent = int((current_course_num / total_courses) * 100)
-                
-                # Progress Hook for granular module scanning
-                def analysis_progress_hook(current_mod, total_mods, mod_status_text):
-                    mod_percent = int((current_mod / total_mods) * 100) if total_mods > 0 else 0
-                    analysis_ui_placeholder.markdown(f"""
-                    <div style="background-color: {theme.BG_DARK}; padding: 20px; border-radius: 8px; border: 1px solid {theme.BG_CARD}; margin-bottom: 20px;">
-                        <h4 style="color: {theme.TEXT_PRIMARY}; margin-top: 0;">🔍 Analyzing Course Data...</h4>
-                        <p style="color: {theme.TEXT_SECONDARY}; font-size: 0.9rem;">Course {current_course_num} of {total_courses}: <b>{esc(course.name)}</b></p>
-                        <p style="color: {theme.ACCENT_BLUE}; font-size: 0.8rem; margin-bottom: 5px;">{mod_status_text}</p>
-                        <div style="background-color: {theme.BG_CARD}; border-radius: 4px; width: 100%; height: 8px; overflow: hidden;">
-                            <div style="background-color: {theme.ACCENT_BLUE}; width: {mod_percent}%; height: 100%; transition: width 0.1s ease;"></div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Cancel button is already rendered above with on_click callback
-                    # No need to re-render inside the hook — the callback fires instantly
 
-                # Render initial modern loading UI
+            # Snapshot session state ONCE — the per-course scans run in worker
+            # threads where st.session_state access is unsafe.
+            _scan_mode = st.session_state['download_mode']
+            _scan_filter = st.session_state['file_filter']
+            # Build scanning-phase secondary settings for accurate counting
+            _scan_secondary = {
+                'download_assignments': st.session_state.get('persistent_dl_assignments', False),
+                'download_syllabus': st.session_state.get('persistent_dl_syllabus', False),
+                'download_announcements': st.session_state.get('persistent_dl_announcements', False),
+                'download_discussions': st.session_state.get('persistent_dl_discussions', False),
+                'download_quizzes': st.session_state.get('persistent_dl_quizzes', False),
+                'download_rubrics': st.session_state.get('persistent_dl_rubrics', False),
+                'isolate_secondary_content': st.session_state.get('persistent_dl_isolate_secondary', True),
+            }
+
+            # On-disk scan cache — repeat scans of unchanged courses become a
+            # dict lookup instead of a full Canvas roundtrip. Keyed on the
+            # course id plus every setting that changes the count; course
+            # listings carry no updated_at, so entries expire on age (like the
+            # course snapshot) to pick up files added or removed since.
+            _SCAN_CACHE_TTL = 3600
+            _scan_cache_path = Path(get_config_dir()) / 'scan_cache.json'
+            try:
+                with open(_scan_cache_path, 'r', encoding='utf-8') as f:
+                    _scan_cache = json.load(f)
+            except Exception:
+                _scan_cache = {}
+
+            _secondary_fingerprint = ''.join(
+                '1' if _scan_secondary[k] else '0' for k in sorted(_scan_secondary))
+
+            def _scan_cache_key(course):
+                return f"{course.id}|{_scan_filter}|{_scan_mode}|{_secondary_fingerprint}"
+
+            def _render_analysis_progress(done_count, active_name=""):
+                percent = int((done_count / total_courses) * 100) if total_courses > 0 else 0
+                detail = f": <b>{esc(active_name)}</b>" if active_name else ""
                 analysis_ui_placeholder.markdown(f"""
                 <div style="background-color: {theme.BG_DARK}; padding: 20px; border-radius: 8px; border: 1px solid {theme.BG_CARD}; margin-bottom: 20px;">
                     <h4 style="color: {theme.TEXT_PRIMARY}; margin-top: 0;">🔍 Analyzing Course Data...</h4>
-                    <p style="color: {theme.TEXT_SECONDARY}; font-size: 0.9rem;">Course {current_course_num} of {total_courses}: <b>{esc(course.name)}</b></p>
+                    <p style="color: {theme.TEXT_SECONDARY}; font-size: 0.9rem;">Scanned {done_count} of {total_courses} courses{detail}</p>
                     <div style="background-color: {theme.BG_CARD}; border-radius: 4px; width: 100%; height: 8px; margin-top: 10px; overflow: hidden;">
-                        <div style="background-color: {theme.ACCENT_BLUE}; width: 0%; height: 100%; transition: width 0.3s ease;"></div>
+                        <div style="background-color: {theme.ACCENT_BLUE}; width: {percent}%; height: 100%; transition: width 0.1s ease;"></div>
                     </div>
                 </div>
                 """, unsafe_allow_html=True)
-                
-                
+
+            def _count_extra_module_items(course_files):
+                """Count Page/ExternalUrl/ExternalTool module items (mirrors download loop).
+
+                The Hybrid fetch already walked every module and emitted a mock
+                CanvasFileInfo (negative 'module_item'-range id) per Page/URL/
+                Tool item, so the count comes straight from that result instead
+                of a second get_modules() pagination pass over the API.
+                """
+                return sum(
+                    1 for f in course_files
+                    if getattr(f, 'id', 1) < 0 and secondary_id_type(f.id) == 'module_item'
+                )
+
+            def _scan_course_blocking(course):
+                """Scan one course; returns (items, mb). Runs inside a worker thread."""
                 # Use robust Hybrid file fetching logic directly, identical to actual download loop
-                try:
-                    # Build scanning-phase secondary settings for accurate counting
-                    _scan_secondary = {
-                        'download_assignments': st.session_state.get('persistent_dl_assignments', False),
-                        'download_syllabus': st.session_state.get('persistent_dl_syllabus', False),
-                        'download_announcements': st.session_state.get('persistent_dl_announcements', False),
-                        'download_discussions': st.session_state.get('persistent_dl_discussions', False),
-                        'download_quizzes': st.session_state.get('persistent_dl_quizzes', False),
-                        'download_rubrics': st.session_state.get('persistent_dl_rubrics', False),
-                        'isolate_secondary_content': st.session_state.get('persistent_dl_isolate_secondary', True),
-                    }
-                    course_files, _ = cm.get_course_files_metadata(
-                        course,
-                        progress_callback=analysis_progress_hook,
-                        secondary_content_settings=_scan_secondary,
-                        is_scanning_phase=True
-                    )
-                    
-                    # Apply file filter if needed ('study' vs 'all')
-                    allowed_exts = ['.pdf', '.ppt', '.pptx', '.pptm', '.pot', '.potx']
+                course_files, _ = cm.get_course_files_metadata(
+                    course,
+                    secondary_content_settings=_scan_secondary,
+                    is_scanning_phase=True
+                )
+
+                # Apply file filter if needed ('study' vs 'all')
+                if _scan_filter == 'study':
                     filtered_files = []
                     for f in course_files:
-                        if st.session_state['file_filter'] == 'study':
-                            # Synthetic secondary items (negative ID) bypass the file filter
-                            # Since the user specifically checked the box to download them.
-                            if getattr(f, 'id', 1) < 0:
-                                filtered_files.append(f)
-                            else:
-                                ext = os.path.splitext(getattr(f, 'filename', ''))[1].lower()
-                                if ext in allowed_exts:
-                                    filtered_files.append(f)
-                        else:
+                        # Synthetic secondary items (negative ID) bypass the file filter
+                        # Since the user specifically checked the box to download them.
+                        if getattr(f, 'id', 1) < 0:
                             filtered_files.append(f)
-                            
-                    total_items += len(filtered_files)
-                    
-                    # Add non-file items if mode is flat and filter is not study
-                    if st.session_state['download_mode'] == 'flat' and st.session_state['file_filter'] != 'study':
-                        try:
-                            modules = course.get_modules()
-                            for module in modules:
-                                items = module.get_module_items()
-                                for item in items:
-                                    if item.type in ['Page', 'ExternalUrl', 'ExternalTool']:
-                                        total_items += 1
-                        except Exception:
-                            pass
-                            
-                    # Add module items if mode is modules
-                    if st.session_state['download_mode'] == 'modules':
+                        else:
+                            name = getattr(f, 'filename', '')
+                            if '.' in name and name.rpartition('.')[2].lower() in _STUDY_EXTS:
+                                filtered_files.append(f)
+                else:
+                    filtered_files = course_files
+
+                items = len(filtered_files)
+
+                # Add non-file module items (Pages/Links) — both modes skip them for 'study'
+                if _scan_mode in ('flat', 'modules') and _scan_filter != 'study':
+                    items += _count_extra_module_items(course_files)
+
+                # Guard against API returning literal None for size which breaks sum()
+                mb = sum((getattr(f, 'size', 0) or 0) for f in filtered_files) / (1024 * 1024)
+                return items, mb
+
+            async def _scan_all():
+                """Overlap per-course scans; bounded so Canvas rate limits stay happy."""
+                sem = asyncio.Semaphore(8)
+
+                async def _scan_one(course):
+                    cached = _scan_cache.get(_scan_cache_key(course))
+                    if (isinstance(cached, dict) and 'count' in cached and 'size_mb' in cached
+                            and time.time() - cached.get('ts', 0) <= _SCAN_CACHE_TTL):
+                        return cached['count'], cached['size_mb']
+                    async with sem:
                         try:
-                            modules = course.get_modules()
-                            for module in modules:
-                                items = module.get_module_items()
-                                for item in items:
-                                    if item.type in ['Page', 'ExternalUrl', 'ExternalTool']:
-                                        if st.session_state['file_filter'] != 'study':
-                                            total_items += 1
+                            items, mb = await asyncio.to_thread(_scan_course_blocking, course)
                         except Exception:
-                            pass
-                    
-                    # Guard against API returning literal None for size which breaks sum()
-                    total_mb += sum((getattr(f, 'size', 0) or 0) for f in filtered_files) / (1024 * 1024)
-                    
-                except Exception:
-                    # Fallback to older count_course_items if Hybrid fetch fails critically
-                    total_items += cm.count_course_items(course, mode=st.session_state['download_mode'], file_filter=st.session_state['file_filter'])
-                    total_mb += cm.get_course_total_size_mb(course, st.session_state['download_mode'], file_filter=st.session_state['file_filter'])
-            
+                            # Fallback to older count_course_items if Hybrid fetch fails critically
+                            items = await cm.count_course_items_async(
+                                course, mode=_scan_mode, file_filter=_scan_filter)
+                            mb = await cm.get_course_total_size_mb_async(
+                                course, _scan_mode, file_filter=_scan_filter)
+                    _scan_cache[_scan_cache_key(course)] = {'count': items, 'size_mb': mb, 'ts': time.time()}
+                    return items, mb
+
+                tasks = [asyncio.create_task(_scan_one(c)) for c in _rehydrate_courses(st.session_state['courses_to_download'])]
+                items_sum = 0
+                mb_sum = 0
+                done_count = 0
+                try:
+                    for fut in asyncio.as_completed(tasks):
+                        # Check if the user clicked the global cancel button between courses
+                        if st.session_state.get('cancel_requested', False):
+                            break # Escape the loop immediately!
+                        items, mb = await fut
+                        items_sum += items
+                        mb_sum += mb
+                        done_count += 1
+                        _render_analysis_progress(done_count)
+                finally:
+                    for t in tasks:
+                        t.cancel()
+                return items_sum, mb_sum
+
+            _render_analysis_progress(0)
+            total_items, total_mb = asyncio.run(_scan_all())
+
+            # Single write-back — best effort, scanning still works without it.
+            # Expired entries (including pre-TTL ones without a timestamp) are
+            # dropped here so the file doesn't grow forever.
+            try:
+                _fresh_cache = {
+                    k: v for k, v in _scan_cache.items()
+                    if isinstance(v, dict) and time.time() - v.get('ts', 0) <= _SCAN_CACHE_TTL
+                }
+                with open(_scan_cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(_fresh_cache, f)
+            except Exception:
+                pass
+
             # Clear UI before dashboard
             analysis_ui_placeholder.empty()
             
@@ -333,12 +488,11 @@ with _main_content.container():
             if st.session_state.get('cancel_requested', False) or st.session_state.get('download_cancelled', False):
                 st.session_state['download_status'] = 'cancelled'
                 st.rerun()
-            elif current_idx < total:
-                
+            else:
                 # Fetch state variables initialized up top
                 start_time = st.session_state.get('start_time', time.time())
                 log_deque = st.session_state.get('log_deque', collections.deque(maxlen=6))
-                
+
                 # Initialize counters if first run
                 if 'downloaded_items' not in st.session_state:
                     st.session_state['downloaded_items'] = 0
@@ -348,12 +502,28 @@ with _main_content.container():
                     st.session_state['download_errors_list'] = []  # Track error messages in memory
                 if 'course_mb_downloaded' not in st.session_state:
                     st.session_state['course_mb_downloaded'] = {}
-                    
-                # Download the current course
-                course = st.session_state['courses_to_download'][current_idx]
+                if '_total_mb_so_far' not in st.session_state:
+                    # Seed the running total once — from here on mb_progress
+                    # ticks update it incrementally instead of re-summing the
+                    # per-course dict on every callback.
+                    st.session_state['_total_mb_so_far'] = sum(st.session_state['course_mb_downloaded'].values())
+
                 total_items = st.session_state.get('total_items', 1)
                 total_mb = st.session_state.get('total_mb', 0)
-                
+
+                # The whole queue now runs inside ONE script execution (no
+                # st.rerun between courses), so the dashboard closures read the
+                # active course from this holder instead of a per-rerun local.
+                _course_queue = _rehydrate_courses(st.session_state['courses_to_download'])
+                total = len(_course_queue)
+                if total == 0:
+                    # Nothing left to resolve (the course list changed between
+                    # sessions) — finish the run instead of indexing an empty
+                    # queue; _rehydrate_courses already surfaced what was lost.
+                    st.session_state['download_status'] = 'done'
+                    st.rerun()
+                _active_course = {'obj': _course_queue[min(current_idx, total - 1)]}
+
                 # Build the shared dashboard placeholders dataclass
                 _dp = DashboardPlaceholders(
                     header=header_placeholder,
@@ -363,8 +533,9 @@ with _main_content.container():
                     log=log_placeholder,
                 )
 
-                def render_dashboard():
-                    current_mb = sum(st.session_state.get('course_mb_downloaded', {}).values())
+                def render_dashboard(force=False):
+                    course = _active_course['obj']
+                    current_mb = st.session_state.get('_total_mb_so_far', 0.0)
                     is_retry = st.session_state.get('download_status') == 'isolated_retry'
                     active_total = st.session_state.get('total_items', total_items)
                     active_current = st.session_state.get('retry_downloaded_items', 0) if is_retry else st.session_state.get('downloaded_items', 0)
@@ -378,11 +549,12 @@ with _main_content.container():
                         downloaded_mb=current_mb,
                         total_mb=st.session_state.get('total_mb', total_mb),
                         start_time=start_time,
+                        force=force,
                     )
-                
+
                 # Render initial state
                 render_dashboard()
-                
+
                 def _clean_display_name(raw_msg):
                     """Strip progress-callback prefixes so only the bare filename is stored."""
                     s = str(raw_msg)
@@ -390,14 +562,29 @@ with _main_content.container():
                         if s.startswith(prefix):
                             return s[len(prefix):]
                     return s
-                
+
+                # Coalesce the per-file "Currently downloading" banner: with
+                # thousands of small files two websocket messages per file
+                # (banner + dashboard) saturate the frontend, so the banner
+                # refreshes every Nth file event. The terminal log itself is
+                # deque-buffered and rendered by the frame-gated dashboard.
+                _file_event_counter = {'n': 0}
+                _ACTIVE_FILE_EVERY = 5
+
+                def _update_active_file(html):
+                    _file_event_counter['n'] += 1
+                    if _file_event_counter['n'] % _ACTIVE_FILE_EVERY == 1:
+                        active_file_placeholder.markdown(html, unsafe_allow_html=True)
+
                 def update_ui(msg, progress_type='log', **kwargs):
                     """Update UI with progress information. Wrapped in try/except for async safety."""
                     try:
                         # Exit silently if cancellation is in progress
                         if st.session_state.get('cancel_requested') or st.session_state.get('download_cancelled'):
                             return
-                        
+
+                        course = _active_course['obj']
+
                         # Lazy-init download file details tracker
                         if 'download_file_details' not in st.session_state:
                             st.session_state['download_file_details'] = {}
@@ -431,9 +618,9 @@ with _main_content.container():
                                     active_file_placeholder.markdown(f"<div style='color: {theme.ACCENT_LINK}; margin-bottom: 10px; font-weight: 500;'>🔄 {icon} Saving {entity_type}: {msg}...</div>", unsafe_allow_html=True)
                                     log_deque.append(f"[✅] {icon} Saved: {msg}")
                                 else:
-                                    active_file_placeholder.markdown(f"<div style='color: {theme.ACCENT_LINK}; margin-bottom: 10px; font-weight: 500;'>🔄 Currently downloading: {msg}...</div>", unsafe_allow_html=True)
+                                    _update_active_file(f"<div style='color: {theme.ACCENT_LINK}; margin-bottom: 10px; font-weight: 500;'>🔄 Currently downloading: {msg}...</div>")
                                     log_deque.append(f"[✅] Finished: {msg}")
-                                    
+
                                 # Track filename for completion screen
                                 course_key = course.name
                                 if course_key not in st.session_state['download_file_details']:
@@ -449,9 +636,9 @@ with _main_content.container():
                                 if progress_type == 'attachment':
                                     log_deque.append(f"<span style='color: {theme.ACCENT_BLUE};'>[📎] Attachment: {msg}</span>")
                                 else:
-                                    active_file_placeholder.markdown(f"<div style='color: {theme.ACCENT_LINK}; margin-bottom: 10px; font-weight: 500;'>🔄 Currently downloading: {msg}...</div>", unsafe_allow_html=True)
+                                    _update_active_file(f"<div style='color: {theme.ACCENT_LINK}; margin-bottom: 10px; font-weight: 500;'>🔄 Currently downloading: {msg}...</div>")
                                     log_deque.append(f"[✅] Finished: {msg}")
-                                    
+
                                 # Track filename for completion screen
                                 course_key = course.name
                                 if course_key not in st.session_state['download_file_details']:
@@ -473,39 +660,44 @@ with _main_content.container():
                             )
                             render_dashboard()
 
-                            
+
                         elif progress_type == 'error':
                             if msg:
                                 if isinstance(msg, DownloadError):
                                     error_obj = msg
                                 else:
                                     error_obj = DownloadError(course.name, "Unknown Item", "Generic Error", str(msg))
-                                
+
                                 sig = f"{error_obj.course_name}|{error_obj.item_name}|{error_obj.error_type}"
                                 seen = st.session_state.get('seen_error_sigs', set())
-                                
+
                                 if sig not in seen:
                                     seen.add(sig)
                                     st.session_state['seen_error_sigs'] = seen
                                     st.session_state['failed_items'] += 1  # <-- STRICTLY INSIDE THE GUARD
                                     st.session_state['total_items'] = max(st.session_state.get('total_items', total_items), st.session_state.get('downloaded_items', 0) + st.session_state['failed_items'])
-                                    
+
                                     if 'download_errors_list' not in st.session_state:
                                         st.session_state['download_errors_list'] = []
                                     st.session_state['download_errors_list'].append(error_obj)
-                                    
+
                                     error_text = f"[{esc(course.name)}] " + (error_obj.message if hasattr(error_obj, 'message') else str(msg))
                                     log_deque.append(f"<span style='color: #FF7B72;'>[❌] Failed: {esc(error_text)}</span>")
-                                    
+
                             render_dashboard()
 
                         elif progress_type == 'mb_progress':
                             mb_down_course = kwargs.get('mb_downloaded', 0)
                             if 'course_mb_downloaded' not in st.session_state:
                                  st.session_state['course_mb_downloaded'] = {}
-                            st.session_state['course_mb_downloaded'][course.id] = mb_down_course
+                            per_course = st.session_state['course_mb_downloaded']
+                            # O(1) incremental total instead of re-summing the
+                            # whole dict on every progress tick
+                            delta = mb_down_course - per_course.get(course.id, 0)
+                            per_course[course.id] = mb_down_course
+                            st.session_state['_total_mb_so_far'] = st.session_state.get('_total_mb_so_far', 0.0) + delta
                             render_dashboard()
-                        
+
                         elif msg and progress_type == 'log':
                             new_line = f"[{esc(course.name)}] {msg}"
                             log_deque.append(f"<span style='color: {theme.TEXT_SECONDARY};'>[ℹ️] {new_line}</span>")
@@ -517,9 +709,9 @@ with _main_content.container():
                         # teardown without killing the download event loop. Cancellation
                         # flows via st.session_state['cancel_requested'] instead.
                         pass
-                
 
-                cm = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
+
+                cm = get_manager(st.session_state['api_token'], st.session_state['api_url'])
                 # Build the Sync Contract — all settings for this download
                 _pp_settings = {
                     'file_filter': st.session_state.get('file_filter', 'all'),
@@ -543,100 +735,138 @@ with _main_content.container():
                     'download_submissions': st.session_state.get('persistent_dl_submissions', False),
                     'isolate_secondary_content': st.session_state.get('persistent_dl_isolate_secondary', True),
                 }
-                asyncio.run(cm.download_course_async(
-                    course,
-                    st.session_state['download_mode'],
-                    st.session_state['download_path'],
-                    progress_callback=update_ui,
-                    check_cancellation=check_cancellation,
-                    file_filter=st.session_state['file_filter'],
-                    debug_mode=st.session_state.get('debug_mode', False),
-                    post_processing_settings=_pp_settings,
-                    secondary_content_settings=_secondary_settings
-                ))
-                
-                # --- Post-Processing: Setup ---
-                # Set explicitly when entering Phase 3
-                st.session_state['is_post_processing'] = True
-                
-                # Re-render cancel button for post-processing phase
-                cancel_placeholder.empty()
-                pp_cancel_placeholder = st.empty()
-                pp_cancel_placeholder.button(
-                    "Cancel Post-Processing",
-                    key="cancel_pp_download",
-                    type="secondary",
-                    on_click=cancel_download_callback,
-                )
 
-                # --- Post-Processing: Setup logging for NotebookLM hooks ---
-                save_dir = st.session_state['download_path']
-                debug_mode = st.session_state.get('debug_mode', False)
-                root_dir = Path(save_dir)
-                course_name = cm._sanitize_filename(course.name)
-                course_folder_for_debug = root_dir / course_name
-                debug_file = (root_dir / "debug_log.txt") if debug_mode else None
+                def _post_process_course(course):
+                    """Run the conversion pipeline for one finished course folder."""
+                    # Set explicitly when entering Phase 3
+                    st.session_state['is_post_processing'] = True
 
-                # Inject course header into the global debug log (append, never overwrite)
-                if debug_file:
-                    try:
-                        with open(debug_file, "a", encoding="utf-8") as f:
-                            f.write(f"\n{'='*50}\n--- Post-Processing: {esc(course.name)} ---\n{'='*50}\n")
-                    except Exception:
-                        pass
+                    # --- Post-Processing: Setup logging for NotebookLM hooks ---
+                    root_dir = Path(st.session_state['download_path'])
+                    debug_mode = st.session_state.get('debug_mode', False)
+                    debug_file = (root_dir / "debug_log.txt") if debug_mode else None
 
-                # --- Post-Download Conversion Pipeline (via engine) ---
-                course_name_sanitized = cm._sanitize_filename(course.name)
-                course_folder = Path(st.session_state['download_path']) / course_name_sanitized
-
-                if course_folder.exists():
-                    invoke_post_processing(
-                        course_folder=course_folder,
-                        course_id=course.id,
-                        course_name=course.name,
-                        placeholders=_dp,
-                        log_deque=log_deque,
-                        error_log_path=Path(st.session_state['download_path']),
-                        mode='download',
-                    )
-                # --- End Post-Download Conversion Pipeline ---
-                # Clear the blue status text so it doesn't linger on completion
-                active_file_placeholder.empty()
-                
-                # Move to next course (unless cancelled)
-                if st.session_state.get('download_cancelled', False):
+                    # Inject course header into the global debug log (append, never overwrite)
+                    if debug_file:
+                        try:
+                            # Drain the buffered writer first so the header
+                            # lands after the download-phase lines
+                            flush_debug_log(debug_file)
+                            with open(debug_file, "a", encoding="utf-8") as f:
+                                f.write(f"\n{'='*50}\n--- Post-Processing: {esc(course.name)} ---\n{'='*50}\n")
+                        except Exception:
+                            pass
+
+                    # --- Post-Download Conversion Pipeline (via engine) ---
+                    course_folder = root_dir / cm._sanitize_filename(course.name)
+                    if course_folder.exists():
+                        invoke_post_processing(
+                            course_folder=course_folder,
+                            course_id=course.id,
+                            course_name=course.name,
+                            placeholders=_dp,
+                            log_deque=log_deque,
+                            error_log_path=root_dir,
+                            mode='download',
+                        )
+                    st.session_state['is_post_processing'] = False
+
+                async def _run_all():
+                    """Drive every remaining course in one event loop.
+
+                    The old pattern downloaded one course per script execution
+                    and st.rerun()'d between courses, re-running the whole
+                    sidebar/auth/step-3 script each time. The placeholders are
+                    updated in place by update_ui, so no rerun is needed until
+                    the entire queue is finished."""
+                    # One TCP/TLS connection pool for the whole queue — a
+                    # per-course session would redo the handshakes every course.
+                    async with cm._make_client_session() as shared_session:
+                        for idx in range(current_idx, total):
+                            if st.session_state.get('cancel_requested') or st.session_state.get('download_cancelled'):
+                                break
+                            course = _course_queue[idx]
+                            _active_course['obj'] = course
+                            st.session_state['current_course_index'] = idx
+                            # Course boundary — always paint, bypassing the frame gate
+                            render_dashboard(force=True)
+
+                            await cm.download_course_async(
+                                course,
+                                st.session_state['download_mode'],
+                                st.session_state['download_path'],
+                                progress_callback=update_ui,
+                                check_cancellation=check_cancellation,
+                                file_filter=st.session_state['file_filter'],
+                                debug_mode=st.session_state.get('debug_mode', False),
+                                post_processing_settings=_pp_settings,
+                                secondary_content_settings=_secondary_settings,
+                                session=shared_session
+                            )
+
+                            if st.session_state.get('download_cancelled', False):
+                                break
+
+                            # The conversion pipeline is blocking, but it runs between
+                            # course downloads so nothing else is waiting on the loop.
+                            _post_process_course(course)
+
+                            # Clear the blue status text so it doesn't linger on completion
+                            active_file_placeholder.empty()
+                            # Post-processing paints its terminal into the dedicated log
+                            # slot, while the download frame renders into the header slot
+                            # only — without a rerun between courses, course N's conversion
+                            # log would otherwise sit frozen under course N+1's dashboard.
+                            log_placeholder.empty()
+                            st.session_state['current_course_index'] = idx + 1
+                            # Flush the final frame for this course — a throttled
+                            # drop here would leave its counters visibly short
+                            render_dashboard(force=True)
+
+                if current_idx < total:
+                    asyncio.run(_run_all())
+                    # The server process outlives the run — drain any tail of
+                    # buffered debug lines now rather than waiting for atexit
+                    flush_debug_log()
+
+                if st.session_state.get('cancel_requested', False) or st.session_state.get('download_cancelled', False):
                     st.session_state['download_status'] = 'cancelled'
                     st.rerun()
-                
-                st.session_state['current_course_index'] += 1
-                
-                # Check if we're done
-                if st.session_state['current_course_index'] >= total:
-                    st.session_state['download_status'] = 'done'
-                    st.balloons()
-                
-                # Auto-rerun instantly to process next course or done screen
-                st.rerun()
-            else:
+
                 # All done
+                # Sanitization is pure string work, but the done screen reruns
+                # on every widget click — compute each folder name once here.
+                st.session_state['sanitized_names'] = {
+                    c.id: cm._sanitize_filename(c.name) for c in _course_queue
+                }
                 st.session_state['download_status'] = 'done'
-                
-                # --- NEW: Force-write session error log (Backup/Guaranteed file) ---
-                if 'download_errors_list' in st.session_state and st.session_state['download_errors_list']:
+
+                # --- Force-write session error log (Backup/Guaranteed file) ---
+                if st.session_state.get('download_errors_list'):
                     try:
-                        from pathlib import Path
                         root_path = Path(st.session_state['download_path'])
                         root_path.mkdir(parents=True, exist_ok=True)
                         session_log = root_path / "session_errors.txt"
-                        with open(session_log, "w", encoding="utf-8") as f:
-                            f.write(f"Session Error Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                            f.write("===================================================\n")
-                            for err in st.session_state['download_errors_list']:
-                                f.write(f"{err.to_log_entry()}\n")
+                        # One write_text call — per-error f.write() would cost a
+                        # buffered-IO call (and potentially a syscall) per line
+                        payload = "\n".join((
+                            f"Session Error Log - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                            "===================================================",
+                            *(err.to_log_entry() for err in st.session_state['download_errors_list']),
+                            "",
+                        ))
+                        session_log.write_text(payload, encoding="utf-8")
                     except Exception as e:
                         logger.error(f"Failed to write session log: {e}")
                 # -------------------------------------------------------------------
-        
+
+                # One celebration per download session — retries and done-screen
+                # reruns skip the (heavy) frontend animation payload.
+                if not st.session_state.get('_balloons_shown'):
+                    st.balloons()
+                    st.session_state['_balloons_shown'] = True
+                st.rerun()
+
         elif st.session_state['download_status'] == 'isolated_retry':
             if st.session_state.get('cancel_requested', False) or st.session_state.get('download_cancelled', False):
                 st.session_state['download_status'] = 'cancelled'
@@ -682,7 +912,7 @@ with _main_content.container():
             log_deque = st.session_state.get('log_deque', collections.deque(maxlen=6))
             
             # Map course_name -> course object
-            course_map = {c.name: c for c in st.session_state.get('courses_to_download', [])}
+            course_map = {c.name: c for c in _rehydrate_courses(st.session_state.get('courses_to_download', []))}
             
             # Group errors by course_name
             queue_by_course = {}
@@ -806,7 +1036,7 @@ with _main_content.container():
                 except Exception:
                     pass
 
-            cm = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
+            cm = get_manager(st.session_state['api_token'], st.session_state['api_url'])
             
             if 'retry_mb_tracker' not in st.session_state:
                 st.session_state['retry_mb_tracker'] = {'bytes_downloaded': 0}
@@ -879,8 +1109,7 @@ with _main_content.container():
             
             resolved_count = 0
             
-            from pathlib import Path
-            temp_cm = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
+            temp_cm = get_manager(st.session_state['api_token'], st.session_state['api_url'])
             
             for c_name, success_list in retry_success_details.items():
                 # 1. Merge into global details
@@ -951,7 +1180,9 @@ with _main_content.container():
                 st.session_state['download_status'] = 'cancelled'
             else:
                 st.session_state['download_status'] = 'done'
-                st.balloons()
+                if not st.session_state.get('_balloons_shown'):
+                    st.balloons()
+                    st.session_state['_balloons_shown'] = True
             st.rerun()
 
         elif st.session_state['download_status'] == 'done':
@@ -998,12 +1229,38 @@ with _main_content.container():
 
             # 3. Error section
             download_path = Path(st.session_state['download_path'])
-            error_log_paths = []
-            for c in st.session_state.get('courses_to_download', []):
-                cm_temp = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
-                log_file = download_path / cm_temp._sanitize_filename(c.name) / "download_errors.txt"
-                if log_file.exists():
-                    error_log_paths.append(log_file)
+            cm_done = get_manager(st.session_state['api_token'], st.session_state['api_url'])
+
+            # Folder names were sanitized once at the running→done transition;
+            # fall back to a fresh pass only for courses missing from the map.
+            _sanitized = st.session_state.get('sanitized_names', {})
+
+            def _course_folder_name(m):
+                cid = m['id'] if isinstance(m, dict) else m.id
+                name = m['name'] if isinstance(m, dict) else m.name
+                return _sanitized.get(cid) or cm_done._sanitize_filename(name)
+
+            # Aggregate once per completion — the done screen reruns on every
+            # widget interaction and shouldn't re-stat N log files each time.
+            # One scandir pass over the download root (dir listings instead of
+            # a stat per course) finds which course folders carry an error log.
+            if 'final_error_log_paths' not in st.session_state:
+                folders_with_log = set()
+                try:
+                    with os.scandir(download_path) as root_it:
+                        course_dirs = [e.name for e in root_it if e.is_dir()]
+                    for dirname in course_dirs:
+                        with os.scandir(download_path / dirname) as it:
+                            if any(e.name == "download_errors.txt" for e in it):
+                                folders_with_log.add(dirname)
+                except OSError:
+                    pass
+                st.session_state['final_error_log_paths'] = [
+                    str(download_path / folder / "download_errors.txt")
+                    for m in st.session_state.get('courses_to_download', [])
+                    if (folder := _course_folder_name(m)) in folders_with_log
+                ]
+            error_log_paths = [Path(p) for p in st.session_state['final_error_log_paths']]
 
             render_error_section(
                 download_errors, error_log_paths,
@@ -1043,6 +1300,8 @@ with _main_content.container():
                                     
                             st.session_state['isolated_retry_queue'] = retriable_queue
                             st.session_state['download_status'] = 'isolated_retry'
+                            # Retry may resolve errors — recompute log paths on next done
+                            st.session_state.pop('final_error_log_paths', None)
                             
                             # --- FIX: Prevent Success Amnesia ---
                             # Initialize sandboxed variables for the retry isolated UI
@@ -1071,10 +1330,9 @@ with _main_content.container():
             # 5. Per-course folder cards with file dropdowns
             # file_details was already filtered above
             folder_paths = {}
-            for c in st.session_state.get('courses_to_download', []):
-                cm_temp = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
-                course_folder = download_path / cm_temp._sanitize_filename(c.name)
-                folder_paths[c.name] = str(course_folder)
+            for m in st.session_state.get('courses_to_download', []):
+                name = m['name'] if isinstance(m, dict) else m.name
+                folder_paths[name] = str(download_path / _course_folder_name(m))
 
             render_folder_cards(file_details, folder_paths, key_prefix='dl')
         
@@ -1140,7 +1398,6 @@ with _main_content.container():
             # Use "Go to front page" for both done and cancelled
             button_text = "🏠 " + 'Go to front page'
             if st.button(button_text, type="primary", use_container_width=True):
-                from core.state_registry import cleanup_download_state
                 cleanup_download_state()
                 st.rerun()
 
@@ -1,27 +1,79 @@
-import os
+import atexit
+import threading
+import time
 from datetime import datetime
-from pathlib import Path
 
 DEFAULT_DEBUG_FILE = "debug_log.txt"
 
-def log_debug(message, debug_file=None):
-    """Writes a message to the debug log if enabled."""
-    if not debug_file:
-        return
+# Lines are buffered per file and flushed in batches — an open/write/close
+# per message is pure syscall overhead in the download loop. A batch goes
+# to disk when it reaches _FLUSH_EVERY lines or the file hasn't been
+# flushed for _FLUSH_INTERVAL seconds, and always at interpreter exit.
+_FLUSH_EVERY = 50
+_FLUSH_INTERVAL = 0.5
+
+_lock = threading.Lock()
+_buffers = {}     # str(path) -> list[str]
+_last_flush = {}  # str(path) -> time.monotonic() of last flush
+
 
+def _write_lines(path, lines):
     try:
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-        with open(debug_file, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {message}\n")
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
     except Exception as e:
         print(f"Debug logging failed: {e}")
 
+
+def log_debug(message, debug_file=None):
+    """Writes a message to the debug log if enabled (buffered)."""
+    if not debug_file:
+        return
+
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    key = str(debug_file)
+    with _lock:
+        buf = _buffers.setdefault(key, [])
+        buf.append(f"[{timestamp}] {message}\n")
+        now = time.monotonic()
+        if len(buf) < _FLUSH_EVERY and (now - _last_flush.get(key, 0.0)) < _FLUSH_INTERVAL:
+            return
+        _buffers[key] = []
+        _last_flush[key] = now
+    _write_lines(key, buf)
+
+
+def flush_debug_log(debug_file=None):
+    """Flush buffered lines to disk — for *debug_file*, or every file if None.
+
+    Call before reading the log or writing to it through another handle,
+    so lines land in chronological order.
+    """
+    with _lock:
+        if debug_file:
+            key = str(debug_file)
+            pending = {key: _buffers.pop(key, [])}
+        else:
+            pending = {k: _buffers.pop(k) for k in list(_buffers)}
+        now = time.monotonic()
+        for key in pending:
+            _last_flush[key] = now
+    for key, lines in pending.items():
+        if lines:
+            _write_lines(key, lines)
+
+
 def clear_debug_log(debug_file=None):
     """Clears the debug log at the start of a run."""
     if not debug_file:
         return
     try:
+        with _lock:
+            _buffers.pop(str(debug_file), None)
         with open(debug_file, "w", encoding="utf-8") as f:
             f.write(f"--- Debug Log Started: {datetime.now()} ---\n")
     except Exception:
         pass
+
+
+atexit.register(flush_debug_log)
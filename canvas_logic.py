@@ -1,3 +1,4 @@
+import functools
 import os
 import platform
 import re
@@ -12,6 +13,8 @@ from canvasapi import Canvas
 from canvasapi.exceptions import CanvasException, Unauthorized, ResourceDoesNotExist
 import asyncio
 import aiohttp
+import random
+import time
 import types
 import threading
 import aiofiles
@@ -39,7 +42,7 @@ def safe_thread_wrapper(func, current_ctx, *args, **kwargs):
         add_script_run_ctx(threading.current_thread(), current_ctx)
     return func(*args, **kwargs)
 
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
 @asynccontextmanager
 async def manage_download_lock(filepath):
@@ -63,6 +66,83 @@ async def manage_download_lock(filepath):
 MAX_RETRIES = 5
 TIMEOUT_SECONDS = 300
 RETRY_DELAY = 1
+BACKOFF_CAP = 30.0
+
+
+def _backoff_delay(attempt, base=RETRY_DELAY, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff: random in [0, min(cap, base * 2^attempt)].
+
+    Deterministic 2^attempt sleeps make every task that failed together retry
+    together; the jitter spreads the re-requests out instead.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def _with_retry(coro_factory, *, retries=MAX_RETRIES, retry_on=(aiohttp.ClientError, asyncio.TimeoutError)):
+    """Await coro_factory() up to `retries` times with jittered backoff.
+
+    Only exceptions in `retry_on` are retried; the final failure re-raises so
+    callers keep their own error handling.
+    """
+    for attempt in range(retries):
+        try:
+            return await coro_factory()
+        except retry_on:
+            if attempt >= retries - 1:
+                raise
+            await asyncio.sleep(_backoff_delay(attempt))
+
+# Precompiled auth-failure matcher — a single C-level scan replaces chained
+# substring tests on every classified exception (input is lowercased first).
+_UNAUTHORIZED_RE = re.compile(r'unauthorized|401|user not authorised')
+
+_ILLEGAL_FILENAME_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+# Extensions the 'study' filter keeps — shared by the enumeration fast-path
+# checks and the authoritative per-file check in _download_file_async.
+STUDY_EXTS = frozenset({'.pdf', '.ppt', '.pptx', '.pptm', '.pot', '.potx'})
+
+_REAL_EXT_RE = re.compile(r'\.[A-Za-z0-9]{2,5}$')
+
+
+def _study_filter_rejects(name):
+    """True when the 'study' filter can rule a name out from its suffix alone.
+
+    Module item titles don't always end in the file's extension, so only a
+    suffix that looks like a real one (2-5 alphanumerics containing a letter)
+    is trusted; anything else stays queued and the exact filename is checked
+    downstream.
+    """
+    if not name:
+        return False
+    m = _REAL_EXT_RE.search(name)
+    if not m:
+        return False
+    ext = m.group(0).lower()
+    if not any(c.isalpha() for c in ext):
+        return False
+    return ext not in STUDY_EXTS
+
+
+@functools.lru_cache(maxsize=1024)
+def sanitize_filename(filename, replace_spaces=False, max_length=120):
+    """Strip filesystem-illegal characters and cap the length of a name.
+
+    Cached: the same course and item titles are sanitized many times per
+    run (scan, download, done screen), and the result is a pure function
+    of its arguments.
+    """
+    if not filename: return "untitled"
+    try: filename = urllib.parse.unquote_plus(filename)
+    except Exception: pass
+    sanitized = _ILLEGAL_FILENAME_RE.sub('', filename)
+    if replace_spaces: sanitized = sanitized.replace(' ', '_')
+    sanitized = sanitized.lstrip(' _').rstrip('. _')
+    if len(sanitized) > max_length:
+        name, ext = os.path.splitext(sanitized)
+        if len(ext) > 10: sanitized = sanitized[:max_length]
+        else: sanitized = name[:(max_length - len(ext))] + ext
+    return sanitized if sanitized else "untitled"
 
 # --- Secondary Content Configuration Defaults ---
 # These are the settings that the UI will eventually expose as checkboxes.
@@ -207,6 +287,28 @@ class CanvasManager:
         except Exception:
             # If URL is completely malformed, Canvas init might fail immediately
             self.canvas = None
+
+        # Widen the connection pool on canvasapi's underlying requests
+        # session: the manager is a cache_resource singleton, so every
+        # paginated /api/v1 call reuses these keep-alive connections
+        # instead of paying a TLS handshake per page. Best effort — the
+        # private attribute path may change between canvasapi versions.
+        if self.canvas is not None:
+            try:
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = self.canvas._Canvas__requester._session
+                adapter = HTTPAdapter(
+                    pool_connections=10,
+                    pool_maxsize=20,
+                    max_retries=Retry(total=3, backoff_factor=0.3,
+                                      status_forcelist=(502, 503, 504)),
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+            except Exception:
+                pass
             
         self.user = None
         self._logged_error_sigs = set()  # Dedup cache: prevents same error being logged twice in one run
@@ -225,9 +327,56 @@ class CanvasManager:
             msg = str(e) if str(e) else 'Login failed. Please check that your Canvas URL and API Token are correct.'
             return False, msg
 
+    def _get_all_courses_fast(self):
+        """Fetch the full course list with concurrent pagination.
+
+        canvasapi's PaginatedList walks pages serially, so total latency is
+        the sum of per-page RTTs. Page 1 is fetched synchronously to learn
+        the page count from the Link rel="last" header; pages 2..N then go
+        out in parallel over the shared keep-alive session. Raises if the
+        Link header is missing so the caller can fall back to canvasapi.
+        """
+        import concurrent.futures
+        from canvasapi.course import Course
+
+        requester = self.canvas._Canvas__requester
+        session = requester._session
+        base = f"{self.api_url}/api/v1/courses"
+        params = {
+            'per_page': 100,
+            'enrollment_state[]': ['active', 'invited_or_pending'],
+            'include[]': ['favorites'],
+        }
+        headers = {'Authorization': f'Bearer {self.api_key}'}
+
+        def _get_page(page):
+            resp = session.get(base, params={**params, 'page': page},
+                               headers=headers, timeout=TIMEOUT_SECONDS)
+            resp.raise_for_status()
+            return resp
+
+        first = _get_page(1)
+        results = list(first.json())
+
+        last_page = 1
+        last_link = first.links.get('last', {}).get('url', '')
+        match = re.search(r'[?&]page=(\d+)', last_link)
+        if match:
+            last_page = int(match.group(1))
+        elif first.links.get('next'):
+            # Paginated but no rel="last" — bail out to the serial path
+            raise ValueError("Canvas response omitted the last-page link")
+
+        if last_page > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+                for resp in pool.map(_get_page, range(2, last_page + 1)):
+                    results.extend(resp.json())
+
+        return [Course(requester, attrs) for attrs in results]
+
     def get_courses(self, favorites_only=True):
         """
-        Fetches courses. 
+        Fetches courses.
         Raises exceptions for UI to handle (no silent failures).
         """
         if not self.canvas:
@@ -239,8 +388,16 @@ class CanvasManager:
                 self.user = self.canvas.get_current_user()
             courses = self.user.get_favorite_courses()
         else:
-            # Fetch active and invited courses
-            courses = self.canvas.get_courses(enrollment_state=['active', 'invited_or_pending'])
+            # Fetch active and invited courses. include=favorites lets callers
+            # derive the favorites list client-side without a second API call.
+            try:
+                courses = self._get_all_courses_fast()
+            except Exception:
+                # Any surprise in the raw pagination path falls back to
+                # canvasapi's serial (but battle-tested) iterator.
+                courses = self.canvas.get_courses(
+                    enrollment_state=['active', 'invited_or_pending'],
+                    include=['favorites'])
         
         # Validation/Filter loop (might raise API errors if connection drops)
         course_list = []
@@ -271,7 +428,7 @@ class CanvasManager:
         # --- Phase 1: Bulk Fetch (get_files) ---
         try:
             # We iterate manually to catch errors during pagination
-            canvas_files = course.get_files()
+            canvas_files = course.get_files(per_page=100)
             for file in canvas_files:
                 if not getattr(file, 'url', ''):
                     continue
@@ -340,13 +497,13 @@ class CanvasManager:
         from sync_manager import CanvasFileInfo
         
         files = []
-        modules = list(course.get_modules())
+        modules = list(course.get_modules(per_page=100))
         total_modules = len(modules)
         for idx, module in enumerate(modules):
             if progress_callback:
                 progress_callback(idx + 1, total_modules, f"Scanning module: {module.name}")
             
-            items = module.get_module_items()
+            items = module.get_module_items(per_page=100)
             for item in items:
                 if item.type == 'File':
                     if not hasattr(item, 'content_id') or not item.content_id:
@@ -919,7 +1076,7 @@ class CanvasManager:
         """
         folder_map = {}
         try:
-            all_folders = course.get_folders()
+            all_folders = course.get_folders(per_page=100)
             for folder in all_folders:
                 full_name = getattr(folder, 'full_name', '')
                 if full_name.startswith("course files"):
@@ -938,13 +1095,13 @@ class CanvasManager:
         Matches the logic of download_course_async (including Hybrid Mode catch-all).
         """
         count = 0
-        allowed_exts = ['.pdf', '.ppt', '.pptx', '.pptm', '.pot', '.potx']
+        allowed_exts = STUDY_EXTS
         
         try:
             if mode == 'flat':
                 # 1. Count Files
                 try:
-                    files = list(course.get_files())
+                    files = list(course.get_files(per_page=100))
                     for f in files:
                         if file_filter == 'study':
                             ext = os.path.splitext(getattr(f, 'filename', ''))[1].lower()
@@ -958,9 +1115,9 @@ class CanvasManager:
                 # 2. Count non-file Module Items 
                 if file_filter != 'study':
                     try:
-                        modules = course.get_modules()
+                        modules = course.get_modules(per_page=100)
                         for module in modules:
-                            items = module.get_module_items()
+                            items = module.get_module_items(per_page=100)
                             for item in items:
                                 if item.type in ['Page', 'ExternalUrl', 'ExternalTool']:
                                     count += 1
@@ -971,21 +1128,21 @@ class CanvasManager:
                 # Modules Mode (Default) - Hybrid Logic
                 # 1. Count Module Items
                 module_file_ids = set()
-                modules = course.get_modules()
+                modules = course.get_modules(per_page=100)
                 for module in modules:
-                    items = module.get_module_items()
+                    items = module.get_module_items(per_page=100)
                     for item in items:
                         if item.type == 'File':
                             if hasattr(item, 'content_id'):
                                 module_file_ids.add(item.content_id)
-                            
+
                             if file_filter == 'study':
-                                # We can't easily check extension of module item without file object, 
-                                # but usually we count it. Accurately? 
-                                # Let's assume for now if filter='study', we only count files?
-                                # Ideally we'd fetch the file to check ext, but that's slow.
-                                # Let's just count it for now.
-                                count += 1
+                                # Fetching the file object per item just for its
+                                # extension is too slow here; trust the title when
+                                # it carries a clear non-study extension, count
+                                # otherwise (download applies the exact check).
+                                if not _study_filter_rejects(getattr(item, 'title', '')):
+                                    count += 1
                             else:
                                 count += 1
                                 
@@ -995,7 +1152,7 @@ class CanvasManager:
                 
                 # 2. Count Catch-All Files (Files NOT in modules)
                 try:
-                    all_files = course.get_files()
+                    all_files = course.get_files(per_page=100)
                     for file in all_files:
                         if file.id in module_file_ids:
                             continue # Already counted
@@ -1014,14 +1171,23 @@ class CanvasManager:
             pass
         return count
     
+    async def count_course_items_async(self, course, mode='modules', file_filter='all'):
+        """Async wrapper for count_course_items — canvasapi is blocking, so the
+        call runs in a worker thread, letting multiple courses scan concurrently."""
+        return await asyncio.to_thread(self.count_course_items, course, mode, file_filter)
+
+    async def get_course_total_size_mb_async(self, course, mode='modules', file_filter='all'):
+        """Async wrapper for get_course_total_size_mb (see count_course_items_async)."""
+        return await asyncio.to_thread(self.get_course_total_size_mb, course, mode, file_filter)
+
     def get_course_total_size_mb(self, course, mode='modules', file_filter='all'):
         """Calculate total size in MB."""
         total_bytes = 0
-        allowed_exts = ['.pdf', '.ppt', '.pptx', '.pptm', '.pot', '.potx']
+        allowed_exts = STUDY_EXTS
         try:
             # Try get_files() first
             try:
-                files = course.get_files()
+                files = course.get_files(per_page=100)
                 for file in files:
                     if file_filter == 'study':
                         ext = os.path.splitext(getattr(file, 'filename', ''))[1].lower()
@@ -1030,9 +1196,9 @@ class CanvasManager:
                     total_bytes += getattr(file, 'size', 0) or 0
             except Exception:
                 # Fallback to modules
-                modules = course.get_modules()
+                modules = course.get_modules(per_page=100)
                 for module in modules:
-                    items = module.get_module_items()
+                    items = module.get_module_items(per_page=100)
                     for item in items:
                         if item.type == 'File':
                             try:
@@ -1048,9 +1214,37 @@ class CanvasManager:
             pass
         return total_bytes / (1024 * 1024)
 
-    async def download_course_async(self, course, mode, save_dir, progress_callback=None, check_cancellation=None, file_filter='all', debug_mode=False, post_processing_settings=None, secondary_content_settings=None):
+    def _make_client_session(self):
+        """Build the download ClientSession (auth header + streaming timeouts).
+
+        Callers downloading several courses in one event loop should create
+        this once and pass it to each download_course_async call — a fresh
+        session per course tears down and rebuilds the TCP/TLS connection
+        pool against the same Canvas host every time.
+        """
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=60, sock_connect=15)
+        # Hard cap at the connector so concurrency is bounded even when several
+        # flows share the session; per-host keeps us polite toward the Canvas
+        # CDN, the DNS cache and keepalive window make reconnects cheap.
+        connector = aiohttp.TCPConnector(
+            limit=16,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+        return aiohttp.ClientSession(
+            headers={'Authorization': f'Bearer {self.api_key}'},
+            timeout=timeout,
+            connector=connector,
+        )
+
+    async def download_course_async(self, course, mode, save_dir, progress_callback=None, check_cancellation=None, file_filter='all', debug_mode=False, post_processing_settings=None, secondary_content_settings=None, session=None):
         """
         Downloads content for a single course asynchronously.
+
+        When `session` is provided the caller owns its lifecycle (so one
+        connection pool can serve a whole course queue); otherwise a
+        session is created and closed for this course only.
         """
         course_name = self._sanitize_filename(course.name)
         base_path = Path(save_dir) / course_name
@@ -1086,6 +1280,7 @@ class CanvasManager:
 
         downloaded_file_ids = set()
         module_file_ids = set()
+        primary_file_tasks = {}  # file id -> first download task; module duplicates link to its result
         seen_target_paths = set()  # Path-based collision tracking
         module_handled_ids = set()  # Secondary entity IDs already handled via module dispatch
         mb_tracker = {'bytes_downloaded': 0}
@@ -1096,9 +1291,10 @@ class CanvasManager:
         sem = asyncio.Semaphore(concurrent_limit)
         
         tasks = []
-        timeout = aiohttp.ClientTimeout(total=None, sock_read=60, sock_connect=15)
 
-        async with aiohttp.ClientSession(headers={'Authorization': f'Bearer {self.api_key}'}, timeout=timeout) as session:
+        async with AsyncExitStack() as _session_stack:
+            if session is None:
+                session = await _session_stack.enter_async_context(self._make_client_session())
             downloaded_files_info = []
             
             try:
@@ -1109,17 +1305,12 @@ class CanvasManager:
                 else:
                     # Modules mode
                     # 1. Fetch Modules
-                    modules = None
-                    for attempt in range(3):
-                        try:
-                            modules = course.get_modules()
-                            modules = list(modules) # Force fetch
-                            break
-                        except Exception as e:
-                            if attempt < 2:
-                                await asyncio.sleep(RETRY_DELAY * (attempt + 1))
-                            else:
-                                raise e
+                    # Blocking canvasapi call — run off-loop so active
+                    # download tasks keep streaming while we paginate.
+                    modules = await _with_retry(
+                        lambda: asyncio.to_thread(lambda: list(course.get_modules(per_page=100))),
+                        retries=3, retry_on=(Exception,),
+                    )
 
                     for module in modules:
                         if check_cancellation and check_cancellation(): break
@@ -1130,8 +1321,27 @@ class CanvasManager:
                             target_path = base_path / module_name
                             target_path.mkdir(parents=True, exist_ok=True)
 
-                            items = list(module.get_module_items())
+                            items = await asyncio.to_thread(lambda m=module: list(m.get_module_items(per_page=100)))
                             log_debug(f"Found {len(items)} items in module '{module.name}'", debug_file)
+
+                            # Each File item needs a full file object (for .url), which
+                            # canvasapi fetches with one blocking round-trip apiece.
+                            # Prefetch them in parallel worker threads; failures fall
+                            # through to a per-item retry so errors keep their usual
+                            # reporting path.
+                            _file_cids = [
+                                it.content_id for it in items
+                                if getattr(it, 'type', None) == 'File' and getattr(it, 'content_id', None)
+                                and not (file_filter == 'study' and _study_filter_rejects(getattr(it, 'title', '')))
+                            ]
+                            _prefetched = await asyncio.gather(
+                                *(asyncio.to_thread(course.get_file, cid) for cid in _file_cids),
+                                return_exceptions=True,
+                            )
+                            file_obj_cache = {
+                                cid: obj for cid, obj in zip(_file_cids, _prefetched)
+                                if not isinstance(obj, BaseException)
+                            }
                             for item in items:
                                 if check_cancellation and check_cancellation(): break
                                 
@@ -1141,6 +1351,11 @@ class CanvasManager:
                                     if item.type == 'File':
                                         if hasattr(item, 'content_id'):
                                             module_file_ids.add(item.content_id)
+                                        # Filter at enumeration: a title with a clear
+                                        # non-study extension never needs its file object,
+                                        # task or lock ceremony.
+                                        if file_filter == 'study' and _study_filter_rejects(getattr(item, 'title', '')):
+                                            continue
                                         if not hasattr(item, 'content_id') or not item.content_id:
                                             # Create Error
                                             err = DownloadError(course.name, getattr(item, 'title', 'unknown'), "Missing Content ID", f"Item {getattr(item, 'title', 'unknown')} missing content_id")
@@ -1148,8 +1363,12 @@ class CanvasManager:
                                             self._log_error(save_dir, err)
                                             continue
                                         
-                                        file_obj = course.get_file(item.content_id)
-                                        # Track the ID for the catch-all phase, but DO NOT skip it here 
+                                        file_obj = file_obj_cache.get(item.content_id)
+                                        if file_obj is None:
+                                            # Prefetch failed for this item — retry once so the
+                                            # error surfaces through the per-item handler below.
+                                            file_obj = await asyncio.to_thread(course.get_file, item.content_id)
+                                        # Track the ID for the catch-all phase, but DO NOT skip it here
                                         # so files appearing in multiple modules get their respective copies.
                                         downloaded_file_ids.add(file_obj.id)
                                         
@@ -1170,12 +1389,26 @@ class CanvasManager:
                                                 counter += 1
                                                 
                                         seen_target_paths.add(target_key)
-                                        log_debug(f"Module file tracked: {filepath.name} (ID: {file_obj.id})", debug_file)
-                                        task = asyncio.create_task(self._download_file_async(
-                                            sem, session, file_obj, target_path, progress_callback, mb_tracker, file_filter, 
-                                            error_root_path=Path(save_dir), course_name=course.name, debug_file=debug_file,
-                                            sync_manager=sync_manager, course_base_path=base_path, explicit_filepath=filepath
-                                        ))
+                                        first_task = primary_file_tasks.get(file_obj.id)
+                                        if first_task is not None:
+                                            # Same file referenced from another module: each module
+                                            # still gets its copy, but the bytes travel only once —
+                                            # wait for the first download and hardlink its result.
+                                            log_debug(f"Module duplicate queued: {filepath.name} (ID: {file_obj.id})", debug_file)
+                                            task = asyncio.create_task(self._clone_module_copy_async(
+                                                first_task, file_obj, filepath, progress_callback,
+                                                error_root_path=Path(save_dir), course_name=course.name,
+                                                debug_file=debug_file, sync_manager=sync_manager,
+                                                course_base_path=base_path
+                                            ))
+                                        else:
+                                            log_debug(f"Module file tracked: {filepath.name} (ID: {file_obj.id})", debug_file)
+                                            task = asyncio.create_task(self._download_file_async(
+                                                sem, session, file_obj, target_path, progress_callback, mb_tracker, file_filter,
+                                                error_root_path=Path(save_dir), course_name=course.name, debug_file=debug_file,
+                                                sync_manager=sync_manager, course_base_path=base_path, explicit_filepath=filepath
+                                            ))
+                                            primary_file_tasks[file_obj.id] = task
                                         tasks.append(task)
                                     
                                     elif item.type == 'Page':
@@ -1187,7 +1420,7 @@ class CanvasManager:
                                             self._log_error(save_dir, err)
                                             continue
                                         
-                                        page_obj = course.get_page(item.page_url)
+                                        page_obj = await asyncio.to_thread(course.get_page, item.page_url)
                                         page_id = getattr(page_obj, 'page_id', getattr(page_obj, 'id', 0))
                                         filepath, _ = self._save_secondary_entity(
                                             'page', getattr(page_obj, 'title', 'Untitled Page'), getattr(page_obj, 'body', '') or '', 
@@ -1387,14 +1620,20 @@ class CanvasManager:
                     log_debug("Starting Catch-All Phase for non-module files...", debug_file)
                     if progress_callback: progress_callback('Scanning remaining files...', progress_type='log')
                     
-                    all_files = course.get_files()
-                    all_files = list(all_files)
+                    all_files = await asyncio.to_thread(lambda: list(course.get_files(per_page=100)))
                     catch_all_tasks = []
 
+                    # Normalize the known-id sets once — building them inside the
+                    # loop made the catch-all scan quadratic in file count.
+                    known_ids = {int(i) for i in downloaded_file_ids} | {int(i) for i in module_file_ids}
+
                     for file in all_files:
                         if check_cancellation and check_cancellation(): break
-                        
-                        if int(file.id) in {int(i) for i in downloaded_file_ids} or int(file.id) in {int(i) for i in module_file_ids}:
+
+                        if file_filter == 'study' and _study_filter_rejects(getattr(file, 'filename', '')):
+                            continue
+
+                        if int(file.id) in known_ids:
                             log_debug(f"Catch-All skipping module file: {file.filename} (ID: {file.id})", debug_file)
                             continue # Already downloaded in a module
                         
@@ -1441,8 +1680,7 @@ class CanvasManager:
 
                 except Exception as e:
                     log_debug(f"Catch-All Phase Error: {e}", debug_file)
-                    error_msg = str(e).lower()
-                    if "unauthorized" in error_msg or "401" in error_msg or "user not authorised" in error_msg:
+                    if _UNAUTHORIZED_RE.search(str(e).lower()):
                         # Just log it to standard console/debug, DO NOT add to user's download_errors.txt
                         print(f"Files tab restricted for {course.name}. Gracefully falling back to module scan.")
                     else:
@@ -1476,7 +1714,7 @@ class CanvasManager:
                 # ---- SECONDARY CONTENT DOWNLOAD ENDED ----
 
             except Exception as e:
-                 is_unauthorized = "unauthorized" in str(e).lower() or (hasattr(e, 'status_code') and e.status_code == 401)
+                 is_unauthorized = bool(_UNAUTHORIZED_RE.search(str(e).lower())) or (hasattr(e, 'status_code') and e.status_code == 401)
                  if is_unauthorized and mode != 'flat':
                      # Fallback to flat
                      msg = 'Modules tab is hidden/unauthorized. Attempting to download files directly...'
@@ -1723,7 +1961,7 @@ class CanvasManager:
         # 1. Fetch Folders
         try:
             if progress_callback: progress_callback('Fetching folder structure...')
-            all_folders = course.get_folders()
+            all_folders = course.get_folders(per_page=100)
             for folder in all_folders:
                 full_name = getattr(folder, 'full_name', '')
                 if full_name.startswith("course files"):
@@ -1742,11 +1980,12 @@ class CanvasManager:
         # 2. Fetch and Download Files
         try:
             if progress_callback: progress_callback('Fetching file list...')
-            files = course.get_files()
-            files = list(files)
+            files = list(course.get_files(per_page=100))
             
             for file in files:
                 if check_cancellation and check_cancellation(): break
+                if file_filter == 'study' and _study_filter_rejects(getattr(file, 'filename', '')):
+                    continue
                 try:
                     # Calculate path
                     folder_id = getattr(file, 'folder_id', None)
@@ -1794,20 +2033,16 @@ class CanvasManager:
         
         
         try:
-            files = None
-            for attempt in range(3):
-                try:
-                    files = course.get_files()
-                    files = list(files) 
-                    break
-                except Exception:
-                    if attempt < 2:
-                        await asyncio.sleep(RETRY_DELAY * (attempt + 1))
-                    else:
-                        files = []
-                        # Log warning
-                        if progress_callback: progress_callback("Files tab restricted, trying modules...", progress_type='log')
-                        log_debug("Files tab restricted (401?), falling back to module scan.", debug_file)
+            try:
+                files = await _with_retry(
+                    lambda: asyncio.to_thread(lambda: list(course.get_files(per_page=100))),
+                    retries=3, retry_on=(Exception,),
+                )
+            except Exception:
+                files = []
+                # Log warning
+                if progress_callback: progress_callback("Files tab restricted, trying modules...", progress_type='log')
+                log_debug("Files tab restricted (401?), falling back to module scan.", debug_file)
 
             downloaded_ids = set()
             seen_flat_paths = set()  # Path-based dedup for flat mode
@@ -1815,6 +2050,9 @@ class CanvasManager:
                 if check_cancellation and check_cancellation(): break
                 if getattr(file, 'id', None):
                     downloaded_ids.add(file.id)
+
+                if file_filter == 'study' and _study_filter_rejects(getattr(file, 'filename', '')):
+                    continue
                 
                 # Synchronous conflict resolution to prevent data loss
                 base_filename = self._sanitize_filename(getattr(file, 'filename', 'unknown'))
@@ -1859,10 +2097,10 @@ class CanvasManager:
             # Module Scan Fallback
             module_tasks = []
             try:
-                modules = course.get_modules()
+                modules = course.get_modules(per_page=100)
                 for module in modules:
                     if check_cancellation and check_cancellation(): break
-                    items = list(module.get_module_items())
+                    items = list(module.get_module_items(per_page=100))
                     log_debug(f"Fallback Scan: Module {module.name} (found {len(items)} items)", debug_file)
                     for item in items:
                         if check_cancellation and check_cancellation(): break
@@ -1873,6 +2111,8 @@ class CanvasManager:
                             log_debug(f"  Fallback Item: {getattr(item, 'title', 'unknown')} (Type: {getattr(item, 'type', 'unknown')})", debug_file)
                             if item.type == 'File':
                                 if not hasattr(item, 'content_id') or not item.content_id: continue
+                                if file_filter == 'study' and _study_filter_rejects(getattr(item, 'title', '')):
+                                    continue
                                 file_obj = course.get_file(item.content_id)
                                 # Synchronous conflict resolution to prevent data loss
                                 base_filename = self._sanitize_filename(getattr(file_obj, 'filename', 'unknown'))
@@ -1977,7 +2217,7 @@ class CanvasManager:
 
         if file_filter == 'study':
             ext = filepath.suffix.lower()
-            if ext not in ['.pdf', '.ppt', '.pptx', '.pptm', '.pot', '.potx']:
+            if ext not in STUDY_EXTS:
                 return
 
         # Only run disk-conflict resolution when the caller hasn't already
@@ -1993,6 +2233,16 @@ class CanvasManager:
             # Re-check existence inside lock
             if filepath.exists():
                 try:
+                    if file_size_bytes == 0 and (getattr(file_obj, 'url', '') or ''):
+                        # Canvas sometimes reports size 0/missing, which used to
+                        # force a re-download on every run. One HEAD recovers the
+                        # real size so both this skip check and the completeness
+                        # check after a GET can validate against it.
+                        try:
+                            async with session.head(file_obj.url, allow_redirects=True) as head_resp:
+                                file_size_bytes = int(head_resp.headers.get('Content-Length', 0) or 0)
+                        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                            pass
                     # We only skip if size matches. If size differs, we overwrite (update).
                     if file_size_bytes > 0 and filepath.stat().st_size == file_size_bytes:
                         log_debug(f"Skipping existing file: {filename}", debug_file)
@@ -2060,6 +2310,11 @@ class CanvasManager:
 
             # aiofiles is imported at module level; reference is used below
 
+            # Resume state: when a network error kills a transfer mid-body the
+            # .part file is kept and the next attempt requests only the
+            # remaining bytes instead of starting over.
+            resume_offset = 0
+
             for attempt in range(MAX_RETRIES):
                 try:
                     # Early Cancellation Guard (API DoS fix)
@@ -2069,15 +2324,25 @@ class CanvasManager:
                     # Request block inside semaphore
                     async with sem:
                         log_debug(f"Requesting URL: {url} (Attempt {attempt+1})", debug_file)
-                        async with session.get(url) as response:
+                        req_headers = {'Range': f'bytes={resume_offset}-'} if resume_offset > 0 else {}
+                        async with session.get(url, headers=req_headers) as response:
                             if response.status == 403 or response.status == 429:
-                                wait = int(response.headers.get('Retry-After', RETRY_DELAY * (2 ** attempt)))
+                                # Honor the server's Retry-After; jitter our own
+                                # guess when it doesn't send one.
+                                retry_after = response.headers.get('Retry-After')
+                                wait = int(retry_after) if retry_after else _backoff_delay(attempt)
                                 raise ValueError(f"RATE_LIMIT:{wait}")
                             elif 500 <= response.status < 600:
                                 raise ValueError(f"SERVER_ERROR:{response.status}")
+                            elif response.status == 416 and resume_offset > 0:
+                                # Our partial is at/beyond the remote size — discard it
+                                # and restart clean on the next attempt.
+                                log_debug("Range not satisfiable — discarding partial and restarting.", debug_file)
+                                resume_offset = 0
+                                continue
 
                             log_debug(f"Response Status: {response.status} Content-Type: {response.headers.get('Content-Type', 'unknown')}", debug_file)
-                            if response.status == 200:
+                            if response.status in (200, 206):
                                 # --- Content-Type Validation ---
                                 # Guards against Canvas returning HTML error pages
                                 # with a 200 status (common LMS failure mode).
@@ -2093,26 +2358,46 @@ class CanvasManager:
                                 # --- Atomic .part Pattern ---
                                 part_path = filepath.parent / (filepath.name + '.part')
                                 download_interrupted = False
-                                
+                                # A 206 means the server honored our Range; a 200 after a
+                                # Range request means it ignored it — truncate and restart.
+                                resuming = (response.status == 206 and resume_offset > 0)
+                                if not resuming:
+                                    resume_offset = 0
+                                total_bytes = resume_offset
+
                                 try:
-                                    async with aiofiles.open(make_long_path(part_path), 'wb') as f:
-                                        total_bytes = 0
-                                        while True:
+                                    async with aiofiles.open(make_long_path(part_path), 'ab' if resuming else 'wb') as f:
+                                        async for chunk in response.content.iter_chunked(1024 * 1024):
                                             # Instant cancel check INSIDE the chunk loop via decoupled callable
                                             if check_cancellation and check_cancellation():
                                                 download_interrupted = True
                                                 break
-                                            
-                                            chunk = await response.content.read(1024*1024)
-                                            if not chunk: break
+
                                             await f.write(chunk)
                                             total_bytes += len(chunk)
                                             
                                             if mb_tracker:
                                                 mb_tracker['bytes_downloaded'] += len(chunk)
-                                                if progress_callback:
+                                                # Coalesce mb_progress emits to 10 Hz across all
+                                                # concurrent tasks (the tracker is shared and the
+                                                # loop is single-threaded, so the gate is race-free).
+                                                # On fast links one emit per chunk per task swamps
+                                                # the UI callback.
+                                                now = time.monotonic()
+                                                if progress_callback and now - mb_tracker.get('last_emit', 0.0) >= 0.1:
+                                                    mb_tracker['last_emit'] = now
                                                     mb_down = mb_tracker['bytes_downloaded'] / (1024 * 1024)
                                                     progress_callback("", progress_type='mb_progress', mb_downloaded=mb_down)
+                                        # Final emit after the loop — a throttled drop on the
+                                        # last chunk would leave the MB counter visibly short.
+                                        if mb_tracker and progress_callback:
+                                            mb_tracker['last_emit'] = time.monotonic()
+                                            progress_callback("", progress_type='mb_progress', mb_downloaded=mb_tracker['bytes_downloaded'] / (1024 * 1024))
+                                except (aiohttp.ClientError, asyncio.TimeoutError) as net_err:
+                                    # Connection died mid-body: keep the .part and record
+                                    # how far we got so the retry resumes from there.
+                                    resume_offset = total_bytes
+                                    raise net_err
                                 except Exception as write_err:
                                     download_interrupted = True
                                     # Clean up .part file on write error
@@ -2209,18 +2494,18 @@ class CanvasManager:
                 except ValueError as ve:
                     msg = str(ve)
                     if msg.startswith("RATE_LIMIT:"):
-                        wait_time = int(msg.split(":")[1])
+                        wait_time = float(msg.split(":")[1])
                         log_debug(f"Rate limited (403/429). Sleeping {wait_time}s outside semaphore.", debug_file)
                         await asyncio.sleep(wait_time)
                         continue
                     elif msg.startswith("SERVER_ERROR:"):
-                        await asyncio.sleep(RETRY_DELAY * (2 ** attempt))
+                        await asyncio.sleep(_backoff_delay(attempt))
                         continue
                     raise ve
                     
                 except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                     if attempt < MAX_RETRIES - 1:
-                        await asyncio.sleep(RETRY_DELAY * (2 ** attempt))
+                        await asyncio.sleep(_backoff_delay(attempt))
                     else:
                         err = DownloadError(course_name, filename, "Network Error", f"Max retries exceeded: {e}", raw_error=e, context={'file_dict': safe_file_dict, 'filepath': str(filepath), 'file_filter': file_filter})
                         if progress_callback: progress_callback(err, progress_type='error', file_size=file_size_bytes)
@@ -2232,6 +2517,69 @@ class CanvasManager:
                     self._log_error(error_root_path, err)
                     return
 
+    async def _clone_module_copy_async(self, primary_task, file_obj, filepath, progress_callback, error_root_path=None, course_name="Unknown", debug_file=None, sync_manager=None, course_base_path=None):
+        """Materialize an extra module copy from an already-scheduled download.
+
+        Modules mode keeps a copy in every module that references a file.
+        Instead of downloading the same bytes per reference, duplicates wait
+        for the primary task and hardlink its result (falling back to a real
+        copy when the filesystem refuses links). Returns the same
+        (CanvasFileInfo, path) tuple shape as _download_file_async so the
+        gather handling upstream is unchanged.
+        """
+        try:
+            result = await primary_task
+        except Exception:
+            # The primary task's own handler already reported this failure.
+            return None
+        if not result:
+            # Primary was skipped/filtered/failed — nothing to duplicate.
+            return None
+        info, src_path = result
+
+        filename = filepath.name
+        try:
+            def _clone():
+                src = make_long_path(src_path)
+                dst = make_long_path(filepath)
+                if filepath.exists():
+                    # A previous run already placed this copy (possibly as a
+                    # hardlink of src) — leave it when it matches.
+                    if os.path.samefile(src, dst) or filepath.stat().st_size == src_path.stat().st_size:
+                        return
+                    filepath.unlink()
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copy2(src, dst)
+            await asyncio.to_thread(_clone)
+        except Exception as e:
+            err = DownloadError(course_name, filename, "Write Error", f"Could not duplicate module copy: {e}", raw_error=e)
+            if progress_callback: progress_callback(err, progress_type='error')
+            self._log_error(error_root_path, err)
+            return None
+
+        log_debug(f"Linked module duplicate: {filepath} <- {src_path}", debug_file)
+
+        if sync_manager and course_base_path:
+            try:
+                rel_path = str(filepath.relative_to(course_base_path)).replace('\\', '/')
+                await asyncio.to_thread(
+                    sync_manager.record_downloaded_file,
+                    canvas_file_id=file_obj.id,
+                    canvas_filename=getattr(file_obj, 'filename', ''),
+                    local_path=rel_path,
+                    canvas_updated_at=getattr(file_obj, 'modified_at', None) or '',
+                    original_size=getattr(file_obj, 'size', 0)
+                )
+            except Exception as db_err:
+                log_debug(f"Warning: DB record failed for {filename}: {db_err}", debug_file)
+
+        if progress_callback:
+            progress_callback(f'Downloading file: {filename}', progress_type='download', explicit_filepath=str(filepath.resolve()))
+
+        return (info, filepath)
+
     # ═══════════════════════════════════════════════════════════════
     # SECONDARY CONTENT ENGINE
     # ═══════════════════════════════════════════════════════════════
@@ -3792,17 +4140,9 @@ class CanvasManager:
         return filepath
 
     def _sanitize_filename(self, filename, replace_spaces=False, max_length=120):
-        if not filename: return "untitled"
-        try: filename = urllib.parse.unquote_plus(filename)
-        except Exception: pass
-        sanitized = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', filename)
-        if replace_spaces: sanitized = sanitized.replace(' ', '_')
-        sanitized = sanitized.lstrip(' _').rstrip('. _')
-        if len(sanitized) > max_length:
-            name, ext = os.path.splitext(sanitized)
-            if len(ext) > 10: sanitized = sanitized[:max_length]
-            else: sanitized = name[:(max_length - len(ext))] + ext
-        return sanitized if sanitized else "untitled"
+        # Pure string work — delegated to the cached module-level function so
+        # repeated names (course titles, module items) are sanitized once.
+        return sanitize_filename(filename, replace_spaces=replace_spaces, max_length=max_length)
 
     def clear_error_log(self, base_path):
         """Wipe download_errors.txt to start fresh for a new run."""
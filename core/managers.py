@@ -0,0 +1,46 @@
+"""
+Managers — Shared cached CanvasManager factory for Canvas Downloader.
+
+Both the download flow (app.py) and the sync flow (sync/) need a
+CanvasManager; constructing one per rerun or per phase throws away the
+underlying requests Session (TCP/TLS keep-alive, retry adapter). The
+cache_resource factory hands every caller the same instance per
+(token, url) pair for the lifetime of the Streamlit server process.
+
+Usage:
+    from core.managers import get_manager
+    cm = get_manager(st.session_state['api_token'], st.session_state['api_url'])
+"""
+
+import streamlit as st
+
+from canvas_logic import CanvasManager
+from sync_manager import SyncManager
+
+
+@st.cache_resource
+def get_manager(token, url):
+    """Memoized CanvasManager — one HTTP session per (token, url) instead of
+    a fresh construction (TCP/TLS/session setup) on every Streamlit rerun."""
+    return CanvasManager(token, url)
+
+
+@st.cache_resource
+def _build_sync_manager(local_folder: str, course_id: int, course_name: str):
+    return SyncManager(local_folder, course_id, course_name)
+
+
+def get_sync_manager(local_folder, course_id, course_name):
+    """Memoized SyncManager for rerun-hot UI paths.
+
+    Construction runs a PRAGMA quick_check over the manifest DB, which
+    scales with manifest size — too expensive to repeat per interaction.
+    SyncManager holds no open handles (every operation connects on
+    demand), so sharing one instance per sync pair is safe. If the DB
+    file was deleted out from under a cached instance, re-run the init
+    so behaviour matches a fresh construction.
+    """
+    sm = _build_sync_manager(str(local_folder), course_id, course_name)
+    if not sm.db_path.exists():
+        sm._init_db()
+    return sm
@@ -41,7 +41,7 @@ DOWNLOAD_DEFAULTS = {
     'api_url': '',
     'is_authenticated': False,
     'download_path': str(Path.home() / "Downloads"),
-    'selected_course_ids': [],
+    'selected_course_ids': set(),
     'step': 1,
     'download_mode': 'modules',
     'cancel_requested': False,
@@ -103,6 +103,8 @@ DOWNLOAD_TRANSIENT_KEYS = {
     'download_status', 'courses_to_download', 'current_course_index',
     'total_items', 'downloaded_items', 'failed_items', 'total_mb',
     'download_errors_list', 'download_file_details', 'seen_error_sigs',
+    'final_error_log_paths', 'sanitized_names', '_total_mb_so_far',
+    '_balloons_shown',
     'start_time', 'log_deque', 'is_post_processing',
     'pp_failure_count', 'pp_success_count',
     # Isolated retry keys
@@ -134,19 +136,19 @@ def ensure_download_state() -> None:
     Replaces the scattered `if key not in st.session_state` blocks
     in app.py (formerly L224-296).
     """
-    for key, default in DOWNLOAD_DEFAULTS.items():
-        if key not in st.session_state:
-            st.session_state[key] = default
-
-    # Per-toggle sub-keys for NotebookLM conversions
-    for nk in NOTEBOOK_SUB_KEYS:
-        if nk not in st.session_state:
-            st.session_state[nk] = False
-
-    # Per-toggle sub-keys for Secondary Content
-    for sck in SECONDARY_CONTENT_KEYS:
-        if sck not in st.session_state:
-            st.session_state[sck] = False
+    # Single batched update — after the first run this is one dict
+    # comprehension with no session-state writes at all.
+    missing = {
+        key: default for key, default in DOWNLOAD_DEFAULTS.items()
+        if key not in st.session_state
+    }
+    # Per-toggle sub-keys for NotebookLM conversions and Secondary Content
+    missing.update({
+        key: False for key in (*NOTEBOOK_SUB_KEYS, *SECONDARY_CONTENT_KEYS)
+        if key not in st.session_state
+    })
+    if missing:
+        st.session_state.update(missing)
 
 
 def ensure_sync_state() -> None:
@@ -154,9 +156,12 @@ def ensure_sync_state() -> None:
 
     Replaces _init_sync_session_state() in sync_ui.py (formerly L83-97).
     """
-    for key, default in SYNC_DEFAULTS.items():
-        if key not in st.session_state:
-            st.session_state[key] = default
+    missing = {
+        key: default for key, default in SYNC_DEFAULTS.items()
+        if key not in st.session_state
+    }
+    if missing:
+        st.session_state.update(missing)
 
 
 # ═══════════════════════════════════════════════
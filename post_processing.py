@@ -10,6 +10,7 @@ Eliminates ~800 lines of duplicated code by providing:
 """
 
 import logging
+import os
 import re
 import time
 from dataclasses import dataclass, field
@@ -60,31 +61,55 @@ class UIBridge:
 # Shared UI Rendering Helpers
 # ─────────────────────────────────────────────────────
 
+# Fast converters (small PPTX, code files) tick many times a second; cap
+# frames at ~10 Hz like the download dashboard. First and last frames of
+# each batch always render so the bar starts at 0 and lands on 100.
+_MIN_FRAME_INTERVAL = 0.1
+_last_frame_ts = 0.0
+_last_frame_sig = None
+
+
 def _render_dashboard(ui: UIBridge, current: int, total: int, task_name: str):
     """Render the post-processing progress dashboard into the caller's placeholders."""
+    global _last_frame_ts, _last_frame_sig
     try:
         if ui.is_cancelled():
             return
+        # Identical frame — nothing observable changed, skip the repaint
+        sig = (id(ui), current, total, task_name)
+        if sig == _last_frame_sig:
+            return
+        now = time.monotonic()
+        is_boundary = current <= 0 or (total > 0 and current >= total)
+        if not is_boundary and (now - _last_frame_ts) < _MIN_FRAME_INTERVAL:
+            return
+        _last_frame_ts = now
+        _last_frame_sig = sig
         accent = _COLOR_MAP.get(task_name, theme.SUCCESS)
         pct = min(100, int((current / total) * 100) if total > 0 else 0)
 
+        # The sync flow paints its own bar/metrics into these slots before
+        # post-processing begins — clear them once so the fused frame below
+        # isn't shown alongside stale chrome.
+        if not getattr(ui, '_stale_chrome_cleared', False):
+            ui.progress_placeholder.empty()
+            ui.metrics_placeholder.empty()
+            ui._stale_chrome_cleared = True
+
+        # One payload (header + bar + metrics) — one ForwardMsg per frame
+        # instead of three. The terminal log lives in its own slot and is
+        # repainted by _log_msg on every append, so it needs no re-render here.
         ui.header_placeholder.markdown(f'''
         <div style="margin-bottom: 0.5rem;">
             <p style="margin: 0; font-size: 0.8rem; color: {theme.TEXT_SECONDARY}; text-transform: uppercase;">🪄 Post-Processing</p>
             <h3 style="margin: 0; padding-top: 0.1rem; color: {theme.TEXT_PRIMARY};">Converting {esc(task_name)}</h3>
         </div>
-        ''', unsafe_allow_html=True)
-
-        ui.progress_placeholder.markdown(f'''
         <div style="background-color: {theme.BG_CARD}; border-radius: 8px; width: 100%; height: 24px; position: relative; margin-bottom: 10px;">
             <div style="background-color: {accent}; width: {pct}%; height: 100%; border-radius: 8px; transition: width 0.3s ease;"></div>
             <div style="position: absolute; top: 0; left: 0; width: 100%; height: 100%; display: flex; align-items: center; justify-content: center; color: {theme.WHITE}; font-size: 12px; font-weight: bold; text-shadow: 0px 0px 2px rgba(0,0,0,0.5);">
                 {pct}%
             </div>
         </div>
-        ''', unsafe_allow_html=True)
-
-        ui.metrics_placeholder.markdown(f'''
         <div style="display: flex; justify-content: center; gap: 4rem; background-color: {theme.BG_DARK}; padding: 15px 25px; border-radius: 8px; border: 1px solid {theme.BG_CARD}; margin-top: 5px; margin-bottom: 15px;">
             <div style="display: flex; flex-direction: column; align-items: center;">
                 <span style="color: {theme.TEXT_SECONDARY}; font-size: 0.75rem; font-weight: bold; text-transform: uppercase;">Converted</span>
@@ -97,14 +122,6 @@ def _render_dashboard(ui: UIBridge, current: int, total: int, task_name: str):
         </div>
         ''', unsafe_allow_html=True)
 
-        # Re-render log so it stays in sync with progress/metrics
-        log_content = "<br>".join(reversed(list(ui.log_lines)))
-        ui.log_placeholder.markdown(f'''
-        <div style="background-color: {theme.BG_TERMINAL}; color: {theme.TERMINAL_TEXT}; padding: 15px; border-radius: 8px; font-family: 'Courier New', monospace; font-size: 0.85rem; height: 140px; border: 1px solid {theme.BORDER_TERMINAL}; line-height: 1.6; overflow-y: hidden; box-shadow: inset 0 2px 4px rgba(0,0,0,0.5);">
-            {log_content}
-        </div>
-        ''', unsafe_allow_html=True)
-
         time.sleep(0.05)
     except (KeyboardInterrupt, SystemExit):
         raise
@@ -112,8 +129,18 @@ def _render_dashboard(ui: UIBridge, current: int, total: int, task_name: str):
         pass
 
 
+# Log-panel debounce, independent of the dashboard gate: per-file success
+# lines may arrive faster than 10 Hz, and every line is kept in the deque
+# regardless — a skipped paint just means the panel lags one flush behind.
+# Errors, cancellations and batch summaries always paint immediately.
+_LOG_MIN_INTERVAL = 0.1
+_last_log_ts = 0.0
+_LOG_FORCE_MARKERS = ('❌', '🛑', '✨', '🪄')
+
+
 def _log_msg(ui: UIBridge, msg: str):
     """Append an HTML log message, log to Python logger, and re-render the terminal."""
+    global _last_log_ts
     try:
         if ui.is_cancelled():
             return
@@ -125,7 +152,12 @@ def _log_msg(ui: UIBridge, msg: str):
 
         ui.log_lines.append(msg)
 
-        log_content = "<br>".join(reversed(list(ui.log_lines)))
+        now = time.monotonic()
+        if (now - _last_log_ts) < _LOG_MIN_INTERVAL and not any(m in msg for m in _LOG_FORCE_MARKERS):
+            return
+        _last_log_ts = now
+
+        log_content = "<br>".join(reversed(ui.log_lines))
         ui.log_placeholder.markdown(f'''
         <div style="background-color: {theme.BG_TERMINAL}; color: {theme.TERMINAL_TEXT}; padding: 15px; border-radius: 8px; font-family: 'Courier New', monospace; font-size: 0.85rem; height: 140px; border: 1px solid {theme.BORDER_TERMINAL}; line-height: 1.6; overflow-y: hidden; box-shadow: inset 0 2px 4px rgba(0,0,0,0.5);">
             {log_content}
@@ -164,11 +196,11 @@ def _update_manifest_path(sm, original_file: Path, converted_path: Path):
     except ValueError:
         return
 
-    manifest = sm.load_manifest()
-    for file_id, info in manifest.get('files', {}).items():
-        if info.get('local_path', '') == original_rel:
-            sm.update_converted_file(int(file_id), new_rel)
-            break
+    # Single-row lookup instead of loading the whole manifest (a full
+    # SQLite table read plus a Python linear scan) for every conversion.
+    file_id = sm.get_file_id_by_path(original_rel)
+    if file_id is not None:
+        sm.update_converted_file(int(file_id), new_rel)
 
 
 def _log_error_to_file(error_log_path: Path | None, filename: str, error_msg: str):
@@ -539,20 +571,34 @@ def run_video_conversion(files, ui: UIBridge):
 # Convenience: Glob + Run All (for app.py Download flow)
 # ─────────────────────────────────────────────────────
 
+def _iter_course_files(course_folder: Path):
+    """Yield every regular file under course_folder, filtering OS junk.
+
+    Uses os.walk (scandir-backed, so file-type comes from the directory
+    entry without a stat() per file) and prunes __MACOSX subtrees instead
+    of descending into them and filtering afterwards.  Each call walks
+    fresh — converters create and delete files between globs, so results
+    must never be snapshotted across conversion steps.
+    """
+    for root, dirs, files in os.walk(course_folder):
+        if "__MACOSX" in dirs:
+            dirs.remove("__MACOSX")
+        for name in files:
+            if name.startswith('._') or name.startswith('~$'):
+                continue
+            yield Path(root) / name
+
+
 def _glob_files(course_folder: Path, extensions: set, explicit_files: list = None) -> list:
     """Glob course folder for files matching extensions, filtering OS junk."""
     if not course_folder.exists():
         return []
-        
+
     explicit_set = {Path(p).resolve() for p in explicit_files} if explicit_files else None
-    
+
     return [
-        f for f in course_folder.rglob('*')
-        if f.is_file()
-        and not f.name.startswith('._')
-        and not f.name.startswith('~$')
-        and "__MACOSX" not in f.parts
-        and f.suffix.lower() in extensions
+        f for f in _iter_course_files(course_folder)
+        if f.suffix.lower() in extensions
         and (not explicit_set or f.resolve() in explicit_set)
     ]
 
@@ -570,9 +616,8 @@ def run_all_conversions(course_folder: Path, sm, contract: dict, ui: UIBridge, c
         # Also catch .tar.gz by full name (since .gz alone may match other files)
         explicit_set = {Path(p).resolve() for p in explicit_files} if explicit_files else None
         extra_targz = [
-            f for f in course_folder.rglob('*')
-            if f.is_file() and f.name.lower().endswith('.tar.gz')
-            and not f.name.startswith('._') and "__MACOSX" not in f.parts
+            f for f in _iter_course_files(course_folder)
+            if f.name.lower().endswith('.tar.gz')
             and f not in archive_files
             and (not explicit_set or f.resolve() in explicit_set)
         ] if course_folder.exists() else []
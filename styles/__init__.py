@@ -32,5 +32,7 @@ def inject_css(filename: str) -> None:
         css_path = _STYLES_DIR / filename
         if not css_path.exists():
             raise FileNotFoundError(f"CSS file not found: {css_path}")
-        _CSS_CACHE[filename] = css_path.read_text(encoding='utf-8')
-    st.markdown(f"<style>{_CSS_CACHE[filename]}</style>", unsafe_allow_html=True)
+        # Cache the fully wrapped block so reruns skip both the disk read
+        # and the <style> string construction.
+        _CSS_CACHE[filename] = f"<style>{css_path.read_text(encoding='utf-8')}</style>"
+    st.markdown(_CSS_CACHE[filename], unsafe_allow_html=True)
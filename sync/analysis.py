@@ -16,7 +16,7 @@ from pathlib import Path
 import streamlit as st
 
 import theme
-from canvas_logic import CanvasManager
+from core.managers import get_manager
 from core.state_registry import NOTEBOOK_SUB_KEYS
 from sync_manager import SyncManager
 from ui_helpers import render_sync_wizard, friendly_course_name
@@ -38,7 +38,7 @@ def run_analysis(sync_pairs, main_placeholder=None):
     if single_idx is not None:
         sync_pairs = [sync_pairs[single_idx]]
 
-    cm = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
+    cm = get_manager(st.session_state['api_token'], st.session_state['api_url'])
     all_results = []
     total_pairs = len(sync_pairs)
 
@@ -33,7 +33,7 @@ import aiohttp
 import streamlit as st
 
 import theme
-from canvas_logic import CanvasManager
+from core.managers import get_manager
 from sync_manager import (
     SyncFileInfo, SyncHistoryManager, CanvasFileInfo,
 )
@@ -161,7 +161,7 @@ def run_sync():
         from canvas_logic import safe_thread_wrapper
         current_ctx = get_script_run_ctx()
         
-        cm = CanvasManager(sync_api_token, sync_api_url)
+        cm = get_manager(sync_api_token, sync_api_url)
         timeout = aiohttp.ClientTimeout(total=None, sock_read=60, sock_connect=15)
         
         # Respect global concurrency limit from session state
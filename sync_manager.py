@@ -1015,6 +1015,32 @@ class SyncManager:
                 return False
         return False
     
+    def get_file_id_by_path(self, local_path: str) -> Optional[int]:
+        """Return the canvas_file_id of the manifest entry with *local_path*.
+
+        Targeted single-row query so post-conversion bookkeeping doesn't
+        have to load the entire manifest into memory per converted file.
+        Returns None if no entry matches (or on DB error).
+        """
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+                    cursor = conn.execute(
+                        'SELECT canvas_file_id FROM sync_manifest WHERE local_path = ?',
+                        (local_path,)
+                    )
+                    row = cursor.fetchone()
+                    return row[0] if row else None
+            except sqlite3.OperationalError as e:
+                if 'database is locked' in str(e) and attempt < max_retries - 1:
+                    time.sleep(0.5)
+                else:
+                    return None
+            except sqlite3.Error:
+                return None
+        return None
+
     def update_converted_file(self, canvas_file_id: int, new_file_path: str) -> bool:
         """
         Update a manifest entry after converting a downloaded file (e.g. PPTX->PDF, HTML->MD).
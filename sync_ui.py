@@ -24,6 +24,7 @@ from collections import defaultdict
 import theme
 
 from sync_manager import SyncManager, SavedGroupsManager
+from core.managers import get_sync_manager
 from ui_helpers import (
     open_folder,
     render_sync_wizard,
@@ -480,7 +481,7 @@ def render_sync_step1(fetch_courses_fn, main_placeholder=None):
             local_folder = pair.get('local_folder')
             course_id = pair.get('course_id')
             if local_folder and Path(local_folder).exists():
-                sm = SyncManager(local_folder, course_id, pair.get('course_name', ''))
+                sm = get_sync_manager(local_folder, course_id, pair.get('course_name', ''))
                 ignored = sm.get_ignored_files()
                 if ignored:
                     ignored_by_course[pair['course_id']] = {
@@ -12,17 +12,23 @@ Contains:
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import logging
 import os
 import platform
+import time
 
 import streamlit as st
 
 import theme
-from canvas_logic import CanvasManager
 from version import __version__
 
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib if the wheel is unavailable
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,8 +42,57 @@ def _get_config_path() -> str:
 CONFIG_FILE = _get_config_path()
 KEYRING_SERVICE = "CanvasDownloader"
 
+# How long a cached token validation stays trusted before re-hitting Canvas.
+VALIDATION_TTL_SECONDS = 600
+
+
+def _token_hash(token: str, url: str) -> str:
+    """Fingerprint of the credentials — stored instead of the raw token."""
+    return hashlib.sha256(f"{token}|{url}".encode('utf-8')).hexdigest()
+
+
+def _read_config() -> dict:
+    """Load the settings JSON as a dict ({} on any failure).
+
+    Uses orjson on raw bytes when available — skips stdlib json's
+    per-character unicode scan on the cold-start path.
+    """
+    try:
+        with open(CONFIG_FILE, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return {}
+    try:
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception:
+        return {}
+
+
+def _write_config(config: dict) -> None:
+    """Serialize and write the settings JSON (errors propagate to caller).
+
+    Skips the write entirely when the payload matches the last one saved
+    this session (Save clicks with nothing changed are common), and swaps
+    the file in atomically via a .tmp + os.replace so a crash mid-write
+    can never tear the config.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(config, sort_keys=True).encode('utf-8')
+
+    digest = hashlib.sha256(payload).digest()
+    if st.session_state.get('_cfg_digest') == digest:
+        return
+
+    tmp_path = CONFIG_FILE + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, CONFIG_FILE)
+    st.session_state['_cfg_digest'] = digest
+
 
-def render_sidebar(fetch_courses_fn):
+def render_sidebar(fetch_courses_fn, get_manager_fn):
     """Render the full sidebar: auth, navigation, settings, logout.
 
     Must be called inside ``with st.sidebar:``.
@@ -45,6 +100,8 @@ def render_sidebar(fetch_courses_fn):
     Args:
         fetch_courses_fn: The ``@st.cache_data``-wrapped ``fetch_courses()``
             function from app.py.  Needed so logout can call ``.clear()``.
+        get_manager_fn: The ``@st.cache_resource``-wrapped ``get_manager()``
+            factory from app.py — reuses one CanvasManager per (token, url).
     """
     st.markdown("---")
     st.title('Canvas Downloader')
@@ -54,73 +111,98 @@ def render_sidebar(fetch_courses_fn):
         st.session_state['token_loaded'] = True
         if os.path.exists(CONFIG_FILE):
             try:
-                with open(CONFIG_FILE, "r", encoding='utf-8') as f:
-                    config = json.load(f)
-                    st.session_state['api_url'] = config.get('api_url', '')
+                config = _read_config()
+                st.session_state['api_url'] = config.get('api_url', '')
 
-                    if 'concurrent_downloads' in config:
-                        st.session_state['concurrent_downloads'] = config.get('concurrent_downloads', 5)
+                if 'concurrent_downloads' in config:
+                    st.session_state['concurrent_downloads'] = config.get('concurrent_downloads', 5)
 
-                    if 'debug_mode' in config:
-                        st.session_state['debug_mode'] = config.get('debug_mode', False)
+                if 'debug_mode' in config:
+                    st.session_state['debug_mode'] = config.get('debug_mode', False)
 
-                    if 'enable_cbs_filters' in config:
-                        st.session_state['enable_cbs_filters'] = config.get('enable_cbs_filters', False)
+                if 'enable_cbs_filters' in config:
+                    st.session_state['enable_cbs_filters'] = config.get('enable_cbs_filters', False)
 
-                    loaded_token = ''
-                    if platform.system() == 'Darwin':
-                        # macOS: Avoid keychain permission prompts by loading from config json via base64
-                        encoded_token = config.get('mac_api_token', '')
-                        if encoded_token:
-                            try:
-                                loaded_token = base64.b64decode(encoded_token.encode('utf-8')).decode('utf-8')
-                            except Exception:
-                                pass
-                    else:
-                        # Windows: Load token from OS keyring (secure)
+                loaded_token = ''
+                if platform.system() == 'Darwin':
+                    # macOS: Avoid keychain permission prompts by loading from config json via base64
+                    encoded_token = config.get('mac_api_token', '')
+                    if encoded_token:
+                        try:
+                            loaded_token = base64.b64decode(encoded_token.encode('utf-8')).decode('utf-8')
+                        except Exception:
+                            pass
+                else:
+                    # Windows: Load token from OS keyring (secure)
+                    try:
+                        import keyring
+                        keyring_user = st.session_state['api_url'] or 'default'
+                        loaded_token = keyring.get_password(KEYRING_SERVICE, keyring_user) or ''
+                    except Exception:
+                        pass  # Keyring unavailable, fall through to legacy check
+
+                    # Legacy migration: if token still in JSON, migrate it to keyring
+                    if not loaded_token and config.get('api_token', ''):
+                        loaded_token = config['api_token']
+                        # Migrate to keyring and strip from JSON
                         try:
                             import keyring
                             keyring_user = st.session_state['api_url'] or 'default'
-                            loaded_token = keyring.get_password(KEYRING_SERVICE, keyring_user) or ''
+                            keyring.set_password(KEYRING_SERVICE, keyring_user, loaded_token)
+                            config.pop('api_token', None)
+                            _write_config(config)
                         except Exception:
-                            pass  # Keyring unavailable, fall through to legacy check
-
-                        # Legacy migration: if token still in JSON, migrate it to keyring
-                        if not loaded_token and config.get('api_token', ''):
-                            loaded_token = config['api_token']
-                            # Migrate to keyring and strip from JSON
-                            try:
-                                import keyring
-                                keyring_user = st.session_state['api_url'] or 'default'
-                                keyring.set_password(KEYRING_SERVICE, keyring_user, loaded_token)
-                                config.pop('api_token', None)
-                                with open(CONFIG_FILE, 'w', encoding='utf-8') as fw:
-                                    json.dump(config, fw)
-                            except Exception:
-                                pass  # Migration failed, will work from RAM this session
-
-                    st.session_state['api_token'] = loaded_token
-
-                    if st.session_state['api_token']:
-                        cm = CanvasManager(st.session_state['api_token'], st.session_state['api_url'])
+                            pass  # Migration failed, will work from RAM this session
+
+                st.session_state['api_token'] = loaded_token
+
+                if st.session_state['api_token']:
+                    # Skip the validate_token roundtrip on cold start if the
+                    # same credentials were validated recently.
+                    fresh_hash = _token_hash(st.session_state['api_token'], st.session_state['api_url'])
+                    cached_name = config.get('user_name', '')
+                    is_fresh = (
+                        cached_name
+                        and config.get('last_valid_hash') == fresh_hash
+                        and (time.time() - config.get('last_valid_ts', 0)) < VALIDATION_TTL_SECONDS
+                    )
+                    if is_fresh:
+                        st.session_state['is_authenticated'] = True
+                        st.session_state['user_name'] = cached_name
+                    else:
+                        # Paint feedback before the blocking roundtrip — the
+                        # sidebar delta flushes to the browser immediately, so
+                        # the first frame shows progress during the API RTT
+                        # instead of an apparently frozen page.
+                        _checking = st.empty()
+                        _checking.caption('🔐 Checking saved credentials…')
+                        cm = get_manager_fn(st.session_state['api_token'], st.session_state['api_url'])
                         valid, msg = cm.validate_token()
+                        _checking.empty()
                         if valid:
                             st.session_state['is_authenticated'] = True
                             st.session_state['user_name'] = msg
+                            config['last_valid_hash'] = fresh_hash
+                            config['last_valid_ts'] = time.time()
+                            config['user_name'] = msg
+                            try:
+                                _write_config(config)
+                            except Exception:
+                                pass
             except Exception:
                 pass
 
     # ── Login form OR authenticated navigation ──────────────────────────
     if not st.session_state['is_authenticated']:
-        _render_login_form()
+        _render_login_form(get_manager_fn)
     else:
-        _render_authenticated_nav(fetch_courses_fn)
+        _render_authenticated_nav(fetch_courses_fn, get_manager_fn)
 
 
 # ─── Private helpers ────────────────────────────────────────────────────
 
 
-def _render_login_form():
+def _render_login_form(get_manager_fn):
     """Render the un-authenticated login form."""
     st.subheader('Authentication')
 
@@ -146,7 +228,7 @@ def _render_login_form():
         st.session_state['api_url'] = input_url
         st.session_state['api_token'] = input_token
 
-        manager = CanvasManager(input_token, input_url)
+        manager = get_manager_fn(input_token, input_url)
         is_valid, message = manager.validate_token()
 
         if is_valid:
@@ -156,15 +238,14 @@ def _render_login_form():
             st.session_state['user_name'] = message.split(": ")[1] if ": " in message else message
 
             # Setup base config data
-            config_data = {}
-            if os.path.exists(CONFIG_FILE):
-                try:
-                    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                        config_data = json.load(f)
-                except Exception:
-                    pass
+            config_data = _read_config()
 
             config_data['api_url'] = st.session_state['api_url']
+            # Cache the successful validation so the next cold start skips it
+            config_data['last_valid_hash'] = _token_hash(
+                st.session_state['api_token'], st.session_state['api_url'])
+            config_data['last_valid_ts'] = time.time()
+            config_data['user_name'] = st.session_state['user_name']
             if 'concurrent_downloads' in st.session_state:
                 config_data['concurrent_downloads'] = st.session_state['concurrent_downloads']
             if 'debug_mode' in st.session_state:
@@ -189,8 +270,7 @@ def _render_login_form():
                     st.warning(f"Could not save token to system keyring: {e}. Token will not persist across sessions.")
 
             try:
-                with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(config_data, f)
+                _write_config(config_data)
             except Exception as e:
                 st.error(f"Could not save config: {e}")
 
@@ -206,7 +286,7 @@ def _render_login_form():
         st.markdown("\n**Crucial Step:** You must input the *actual* Canvas URL, not your university's login portal.\n\n**How to find it:**\n1. Log in to Canvas in your browser.\n2. Look at the address bar **after** you have logged in.\n3. It often looks like `https://schoolname.instructure.com` (even if you typed `canvas.school.edu` to get there).\n4. Copy that URL and paste it here.\n")
 
 
-def _render_authenticated_nav(fetch_courses_fn):
+def _render_authenticated_nav(fetch_courses_fn, get_manager_fn):
     """Render the authenticated sidebar: user label, navigation buttons,
     settings dialog, logout, and version badge."""
     st.success(st.session_state['user_name'])
@@ -339,14 +419,7 @@ def _render_authenticated_nav(fetch_courses_fn):
                 st.session_state['enable_cbs_filters'] = temp_cbs
 
                 # Persist to config
-                if os.path.exists(CONFIG_FILE):
-                    try:
-                        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                            config_data = json.load(f)
-                    except Exception:
-                        config_data = {}
-                else:
-                    config_data = {}
+                config_data = _read_config()
 
                 config_data['api_url'] = st.session_state.get('api_url', '')
                 config_data.pop('api_token', None)  # Never write token to JSON
@@ -355,8 +428,7 @@ def _render_authenticated_nav(fetch_courses_fn):
                 config_data['enable_cbs_filters'] = temp_cbs
 
                 try:
-                    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                        json.dump(config_data, f)
+                    _write_config(config_data)
                 except Exception as e:
                     st.error(f"⚠️ Could not save settings to disk: {e}")
 
@@ -389,17 +461,18 @@ def _render_authenticated_nav(fetch_courses_fn):
         st.session_state['current_mode'] = 'download'
         # Clear the course cache to prevent showing old user's courses
         fetch_courses_fn.clear()
+        # Drop the cached CanvasManager so a new login builds a fresh session
+        get_manager_fn.clear()
         if os.path.exists(CONFIG_FILE):
             try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
+                config_data = _read_config()
                 config_data.pop('api_token', None)
                 config_data.pop('mac_api_token', None)
-                # Atomic .tmp swap pattern — prevents disk-tearing on logout
-                tmp_path = CONFIG_FILE + '.tmp'
-                with open(tmp_path, 'w', encoding='utf-8') as f:
-                    json.dump(config_data, f)
-                os.replace(tmp_path, CONFIG_FILE)
+                # Invalidate the cached validation along with the token
+                config_data.pop('last_valid_hash', None)
+                config_data.pop('last_valid_ts', None)
+                config_data.pop('user_name', None)
+                _write_config(config_data)
             except Exception as e:
                 logger.warning(f"Could not update config on logout: {e}")
         st.rerun()
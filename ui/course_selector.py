@@ -215,6 +215,42 @@ def render_favorites_pill(namespace: str, default_favorites: bool = True) -> boo
     return st.session_state[state_key] == "favorites"
 
 
+@st.cache_data(show_spinner=False)
+def _compute_course_meta(fingerprint: tuple):
+    """Parse CBS metadata for every (id, name) pair in ``fingerprint``.
+
+    Keyed on the id/name tuple so the result survives reruns and only
+    recomputes when the visible course list actually changes.
+    """
+    course_meta = {}
+    all_types = set()
+    all_semesters = set()
+    all_years = set()
+    # Inverted indexes (value -> course ids) so filtering intersects sets
+    # instead of testing three predicates per course per rerun.
+    idx_type = {}
+    idx_sem = {}
+    idx_year = {}
+
+    for cid, name in fingerprint:
+        meta = parse_cbs_metadata(name)
+        course_meta[cid] = meta
+        if meta['type']:
+            all_types.add(meta['type'])
+            idx_type.setdefault(meta['type'], set()).add(cid)
+        if meta['semester']:
+            all_semesters.add(meta['semester'])
+            idx_sem.setdefault(meta['semester'], set()).add(cid)
+        if meta['year_full']:
+            all_years.add(meta['year_full'])
+            idx_year.setdefault(meta['year_full'], set()).add(cid)
+
+    # Return the option lists pre-sorted (years newest-first) so the
+    # multiselects consume them as-is on every rerun.
+    return (course_meta, sorted(all_types), sorted(all_semesters),
+            sorted(all_years, reverse=True), (idx_type, idx_sem, idx_year))
+
+
 def render_cbs_filters(courses: list, namespace: str, custom_toggle_container=None) -> list:
     """Render CBS toggle + filter criteria and return the filtered course list.
 
@@ -238,43 +274,36 @@ def render_cbs_filters(courses: list, namespace: str, custom_toggle_container=No
     filtered_courses = list(courses)
 
     if show_filters:
-        course_meta = {}
-        all_types = set()
-        all_semesters = set()
-        all_years = set()
-
-        for c in courses:
-            meta = parse_cbs_metadata(getattr(c, 'name', ''))
-            course_meta[c.id] = meta
-            if meta['type']: all_types.add(meta['type'])
-            if meta['semester']: all_semesters.add(meta['semester'])
-            if meta['year_full']: all_years.add(meta['year_full'])
+        # Hoisted + cached: flipping a filter widget reruns the script, but
+        # the metadata only changes when the course list itself does.
+        _fingerprint = tuple((c.id, getattr(c, 'name', '')) for c in courses)
+        course_meta, all_types, all_semesters, all_years, indexes = _compute_course_meta(_fingerprint)
 
         with st.container(border=True, key=f"cbs_container_{namespace}"):
             c1, c2, c3 = st.columns(3)
             with c1:
                 sel_types = st.multiselect(
-                    'Class Type', options=sorted(list(all_types)),
+                    'Class Type', options=all_types,
                     key=f"{namespace}_cbs_type")
             with c2:
                 sel_semesters = st.multiselect(
-                    'Semester', options=sorted(list(all_semesters)),
+                    'Semester', options=all_semesters,
                     key=f"{namespace}_cbs_sem")
             with c3:
                 sel_years = st.multiselect(
-                    'Year', options=sorted(list(all_years), reverse=True),
+                    'Year', options=all_years,
                     key=f"{namespace}_cbs_year")
 
         if sel_types or sel_semesters or sel_years:
-            temp_filtered = []
-            for c in courses:
-                meta = course_meta[c.id]
-                match_type = meta['type'] in sel_types if sel_types else True
-                match_sem = meta['semester'] in sel_semesters if sel_semesters else True
-                match_year = meta['year_full'] in sel_years if sel_years else True
-                if match_type and match_sem and match_year:
-                    temp_filtered.append(c)
-            filtered_courses = temp_filtered
+            idx_type, idx_sem, idx_year = indexes
+            candidates = {c.id for c in courses}
+            if sel_types:
+                candidates &= set().union(*(idx_type.get(t, set()) for t in sel_types))
+            if sel_semesters:
+                candidates &= set().union(*(idx_sem.get(s, set()) for s in sel_semesters))
+            if sel_years:
+                candidates &= set().union(*(idx_year.get(y, set()) for y in sel_years))
+            filtered_courses = [c for c in courses if c.id in candidates]
 
     return filtered_courses
 
@@ -297,7 +326,7 @@ def render_course_list(
 
     Multi-select:
         Reads/writes ``st.session_state['selected_course_ids']``.
-        Returns the updated list of selected course IDs.
+        Returns the updated set of selected course IDs.
 
     Single-select:
         Reads/writes ``st.session_state['{namespace}_selected_id']``.
@@ -306,12 +335,15 @@ def render_course_list(
     if not courses:
         st.info('No courses match the selected filters.')
         if multi_select:
-            return []
+            return set()
         else:
             return None
 
+    # _name_lower is precomputed at fetch time; fall back for courses that
+    # arrive from other sources (sync pairs, hub dialogs).
     sorted_courses = sorted(
-        courses, key=lambda c: (getattr(c, 'name', '') or '').lower())
+        courses,
+        key=lambda c: getattr(c, '_name_lower', None) or (getattr(c, 'name', '') or '').lower())
 
     if multi_select:
         return _render_multi_select_list(sorted_courses, namespace)
@@ -321,15 +353,23 @@ def render_course_list(
 
 
 def _render_multi_select_list(courses: list, namespace: str) -> list:
-    """Multi-select checkbox list (Download mode)."""
-    selected_ids = st.session_state.get('selected_course_ids', [])
+    """Multi-select checkbox list (Download mode).
+
+    Select All / Clear Selection work via a remount tick rather than O(N)
+    per-checkbox session-state writes: bumping ``{namespace}_select_tick``
+    changes every checkbox key, so they remount with the bulk default from
+    ``{namespace}_select_value``.
+    """
+    # Selection lives as a set — membership tests in the render loop are
+    # O(1) per course instead of scanning a list.
+    selected_ids = set(st.session_state.get('selected_course_ids', set()))
     visible_ids = {c.id for c in courses}
-    new_selected_ids = []
+
+    tick = st.session_state.get(f"{namespace}_select_tick", 0)
+    bulk_value = st.session_state.get(f"{namespace}_select_value")
 
     # Preserve off-screen selections (hidden by CBS filters)
-    for sid in selected_ids:
-        if sid not in visible_ids:
-            new_selected_ids.append(sid)
+    new_selected_ids = selected_ids - visible_ids
 
     # ――― Inject global CSS for this list ―――
     st.markdown(f"""<style>
@@ -377,7 +417,7 @@ def _render_multi_select_list(courses: list, namespace: str) -> list:
     for course in courses:
         base_name, code = get_course_display_parts(course)
         code_clean = code.strip("()") if code else ""
-        chk_key = f"{namespace}_chk_{course.id}"
+        chk_key = f"{namespace}_chk_{course.id}_{tick}"
 
         # Inject code subtext via CSS
         if code_clean:
@@ -394,18 +434,23 @@ def _render_multi_select_list(courses: list, namespace: str) -> list:
 
         # NO columns! Just st.checkbox
         if chk_key not in st.session_state:
-            checked = st.checkbox(
-                base_name, value=(course.id in selected_ids),
-                key=chk_key)
+            # Fresh mount (first render or post-bulk-action remount): the
+            # default is the bulk value if one was just requested.
+            default = bulk_value if bulk_value is not None else (course.id in selected_ids)
+            checked = st.checkbox(base_name, value=default, key=chk_key)
         else:
             checked = st.checkbox(base_name, key=chk_key)
 
         if checked:
-            new_selected_ids.append(course.id)
+            new_selected_ids.add(course.id)
 
     if dynamic_css:
         st.markdown(f'<style>{"".join(dynamic_css)}</style>', unsafe_allow_html=True)
 
+    # Bulk default applies only to the remount run itself — later mounts
+    # (e.g. courses revealed by filter changes) fall back to selected_ids.
+    st.session_state[f"{namespace}_select_value"] = None
+
     st.session_state['selected_course_ids'] = new_selected_ids
     return new_selected_ids
 
@@ -495,9 +540,15 @@ def _render_single_select_list(courses: list, namespace: str):
 # Download Mode — Step 1: Select Courses
 # ═══════════════════════════════════════════════════════════════════════
 
+@st.fragment
 def render_course_selector(fetch_courses_fn):
     """Render the Step 1 course selection page for Download mode.
 
+    Runs as a fragment: checkbox toggles, filter changes, and bulk
+    selections rerun only this block instead of the whole script
+    (sidebar auth, CSS injection, step dispatch). Only the Continue
+    button escalates to a full app rerun to advance the wizard.
+
     Args:
         fetch_courses_fn: The ``@st.cache_data``-wrapped ``fetch_courses()``
             function from app.py.
@@ -596,18 +647,18 @@ def render_course_selector(fetch_courses_fn):
 
     visible_ids = {c.id for c in filtered_courses}
 
+    # Bulk actions are O(1): bump the remount tick and let the checkbox list
+    # remount with the requested default instead of writing N state keys.
     if select_all_clicked:
-        current_ids = set(st.session_state.get('selected_course_ids', []))
-        new_ids = current_ids.union(visible_ids)
-        st.session_state['selected_course_ids'] = list(new_ids)
-        for cid in visible_ids:
-            st.session_state[f"dl_chk_{cid}"] = True
+        st.session_state['selected_course_ids'] = set(st.session_state.get('selected_course_ids', set())) | visible_ids
+        st.session_state['dl_select_tick'] = st.session_state.get('dl_select_tick', 0) + 1
+        st.session_state['dl_select_value'] = True
         st.rerun()
 
     if clear_sel_clicked:
-        st.session_state['selected_course_ids'] = []
-        for c in courses:
-            st.session_state[f"dl_chk_{c.id}"] = False
+        st.session_state['selected_course_ids'] = set()
+        st.session_state['dl_select_tick'] = st.session_state.get('dl_select_tick', 0) + 1
+        st.session_state['dl_select_value'] = False
         st.rerun()
 
     # --- Course list (centralized) ---
@@ -626,4 +677,6 @@ def render_course_selector(fetch_courses_fn):
             error_container.error('Please select at least one course.')
         else:
             st.session_state['step'] = 2
-            st.rerun()
+            # Leaving the wizard step requires the full script to rerun —
+            # a fragment-scoped rerun would redraw Step 1.
+            st.rerun(scope="app")
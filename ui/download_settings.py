@@ -15,7 +15,6 @@ from __future__ import annotations
 import base64
 import os
 import sys
-import time
 from pathlib import Path
 
 import streamlit as st
@@ -57,9 +56,16 @@ def _get_chevron_base64(is_expanded):
     return f"url('data:image/svg+xml;base64,{b64_str}')"
 
 
+@st.fragment
 def render_download_settings(fetch_courses_fn):
     """Render the full Step 2 download settings page.
 
+    Runs as a fragment so toggle/radio interactions rerun only this
+    block — an st.form was considered instead, but the master/sub
+    toggle callbacks and card expansion need live reruns, which a form
+    would suppress until submit. Confirm and Back escalate to app-scope
+    reruns to leave the wizard step.
+
     Args:
         fetch_courses_fn: The cached ``fetch_courses()`` function from app.py.
     """
@@ -1401,8 +1407,17 @@ def render_download_settings(fetch_courses_fn):
                 try:
                     # Initialize download state
                     all_courses = fetch_courses_fn(st.session_state['api_token'], st.session_state['api_url'], False)
-                    course_map = {c.id: c for c in all_courses}
-                    courses_to_download = [course_map[cid] for cid in st.session_state['selected_course_ids'] if cid in course_map]
+                    selected_ids = set(st.session_state['selected_course_ids'])
+                    # Store only slim id/name pairs — full canvasapi Course
+                    # objects are heavyweight (they carry a requester) and get
+                    # pickled with session state; app.py rehydrates real
+                    # objects from the cached course list at download time.
+                    # Iterating the (sorted) course list keeps the download
+                    # order alphabetical now that the selection is a set.
+                    courses_to_download = [
+                        {'id': c.id, 'name': c.name}
+                        for c in all_courses if c.id in selected_ids
+                    ]
 
                     st.session_state['courses_to_download'] = courses_to_download
                     st.session_state['current_course_index'] = 0
@@ -1410,6 +1425,8 @@ def render_download_settings(fetch_courses_fn):
                     st.session_state['total_items'] = 0
                     st.session_state['downloaded_items'] = 0
                     st.session_state['course_mb_downloaded'] = {}
+                    st.session_state['_total_mb_so_far'] = 0.0
+                    st.session_state['_balloons_shown'] = False
                     st.session_state['log_content'] = ""  # Initialize log content
                     st.session_state['seen_error_sigs'] = set()  # Clear deduplication state for fresh download
 
@@ -1442,15 +1459,15 @@ def render_download_settings(fetch_courses_fn):
                         st.session_state['download_status'] = 'scanning'
                         st.session_state['step'] = 3
 
-                    # Brief pause to ensure state is saved before rerun
-                    time.sleep(0.1)
+                    # session_state writes are synchronous — no settle delay needed
                     step2_container.empty() # Clear EVERYTHING in Step 2
-                    st.rerun()
+                    # Leaving Step 2 — escape the fragment scope.
+                    st.rerun(scope="app")
                 except Exception as e:
                     st.error(f"Error initializing: {e}")
 
         with col_back:
             if st.button('Back', use_container_width=True, key='action_dl_back'):
                 st.session_state['step'] = 1
-                st.rerun()
+                st.rerun(scope="app")
 
@@ -20,6 +20,7 @@ import streamlit as st
 
 import theme
 from sync_manager import SyncManager, SavedGroupsManager
+from core.managers import get_sync_manager
 from ui_helpers import (
     esc,
     friendly_course_name,
@@ -926,7 +927,7 @@ def render_hub_config(pair: dict):
         return
 
     try:
-        sm = SyncManager(local_folder, course_id, pair.get('course_name', ''))
+        sm = get_sync_manager(local_folder, course_id, pair.get('course_name', ''))
         raw_contract = sm._load_metadata('sync_contract')
         raw_mode = sm._load_metadata('download_mode') # Load download_mode directly
         raw_secondary = sm._load_metadata('secondary_content_contract')
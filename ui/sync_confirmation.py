@@ -16,7 +16,8 @@ import urllib.parse
 import streamlit as st
 
 import theme
-from sync_manager import SyncManager, get_file_icon
+from sync_manager import get_file_icon
+from core.managers import get_sync_manager
 from ui_helpers import (
     friendly_course_name,
     format_file_size,
@@ -279,7 +280,7 @@ def show_sync_confirmation_inner(sync_selections, count, size, folders, avail_mb
             for _s in sync_selections:
                 try:
                     _p = _s['res_data']['pair']
-                    _sm = SyncManager(_p['local_folder'], _p['course_id'], _p.get('course_name', ''))
+                    _sm = get_sync_manager(_p['local_folder'], _p['course_id'], _p.get('course_name', ''))
                     _raw = _sm._load_metadata('sync_contract')
                     _s['res_data']['contract'] = json.loads(_raw) if _raw else {}
                 except Exception:
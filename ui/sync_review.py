@@ -19,6 +19,7 @@ import streamlit as st
 
 import theme
 from sync_manager import get_file_icon
+from core.managers import get_sync_manager
 from ui_helpers import (
     render_sync_wizard,
     friendly_course_name,
@@ -53,11 +54,11 @@ def show_analysis_review(on_confirm_sync):
 
     st.markdown(f"<h3 style='margin-bottom: -15px; margin-top: 10px;'>🔍  {'Review Changes'}</h3>", unsafe_allow_html=True)
 
-    from sync_manager import SyncFileInfo, SyncManager
+    from sync_manager import SyncFileInfo
 
     def handle_ignore(pair_idx, canvas_file_id, source_list_name, item):
         pair_data = st.session_state['sync_analysis_results'][pair_idx]
-        sm = SyncManager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
+        sm = get_sync_manager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
         # Extract filename for UPSERT (works for new files not yet in DB)
         if isinstance(item, tuple):
             fname = item[0].display_name or item[0].filename if hasattr(item[0], 'filename') else ''
@@ -101,7 +102,7 @@ def show_analysis_review(on_confirm_sync):
 
     def handle_restore(pair_idx, sync_info):
         pair_data = st.session_state['sync_analysis_results'][pair_idx]
-        sm = SyncManager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
+        sm = get_sync_manager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
         sm.restore_file(sync_info.canvas_file_id)
         
         sync_info.is_ignored = False
@@ -135,7 +136,7 @@ def show_analysis_review(on_confirm_sync):
 
     def handle_restore_all(pair_idx):
         pair_data = st.session_state['sync_analysis_results'][pair_idx]
-        sm = SyncManager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
+        sm = get_sync_manager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
         
         if not hasattr(pair_data['result'], 'ignored_files') or not pair_data['result'].ignored_files:
             return
@@ -201,7 +202,7 @@ def show_analysis_review(on_confirm_sync):
         if not items_to_ignore:
             return
             
-        sm = SyncManager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
+        sm = get_sync_manager(pair_data['pair']['local_folder'], pair_data['pair']['course_id'], pair_data['pair']['course_name'])
         sm.bulk_ignore_files(file_ids_and_names)
         
         if not hasattr(pair_data['result'], 'ignored_files'):
@@ -3,6 +3,7 @@ UI Helper utilities for Canvas LMS Batch File Downloader.
 Shared helpers used by both download and sync modes.
 """
 
+import functools
 import html
 import logging
 import os
@@ -33,8 +34,13 @@ def resolve_path(path):
         return os.path.join(sys._MEIPASS, path)
     return path
 
+@functools.lru_cache(maxsize=64)
 def get_base64_image(image_path):
-    """Reads a local file and returns its Base64 string representation."""
+    """Reads a local file and returns its Base64 string representation.
+
+    Cached — the icon assets are static, so each PNG is read and encoded
+    once per process instead of on every Streamlit rerun.
+    """
     try:
         with open(resolve_path(image_path), "rb") as image_file:
             return base64.b64encode(image_file.read()).decode()
@@ -316,6 +322,13 @@ def check_disk_space(path: str, required_bytes: int = 0, min_free_gb: float = 1.
 
 # --- Folder Opener ---
 
+# Resolved once at import — stat'ing and parsing the .ico on every picker
+# click is pure overhead on the Tk startup path.
+_PICKER_ICON_PATH = os.path.join(os.path.dirname(__file__), 'assets', 'icon.ico')
+if not os.path.exists(_PICKER_ICON_PATH):
+    _PICKER_ICON_PATH = None
+
+
 def native_folder_picker() -> str | None:
     """Open native folder picker dialog safely across threads inside Streamlit.
     Builds the Tkinter root with correct attributes, destroys it on close,
@@ -343,18 +356,21 @@ def native_folder_picker() -> str | None:
 
     import tkinter as tk
     from tkinter import filedialog
-    
+
+    # The Tk root is deliberately NOT cached: Tk is thread-affine and each
+    # Streamlit rerun executes on a fresh script thread, so a reused root
+    # would be driven from the wrong thread. Create/destroy per click and
+    # keep the per-call work minimal instead.
     root = tk.Tk()
     root.withdraw()
     root.wm_attributes('-topmost', 1)
-    
-    try:
-        icon_path = os.path.join(os.path.dirname(__file__), 'assets', 'icon.ico')
-        if os.path.exists(icon_path):
-            root.iconbitmap(icon_path)
-    except Exception:
-        pass
-        
+
+    if _PICKER_ICON_PATH:
+        try:
+            root.iconbitmap(_PICKER_ICON_PATH)
+        except Exception:
+            pass
+
     folder_path = filedialog.askdirectory(master=root)
     root.destroy()
     return folder_path if folder_path else None
@@ -484,8 +500,19 @@ def get_course_display_parts(course) -> tuple[str, str]:
     """
     raw_name = (getattr(course, 'friendly_name', None)
                 or getattr(course, 'name', '') or '')
-    display_name = friendly_course_name(raw_name)
     code = getattr(course, 'course_code', '') or ''
+    return _display_parts_cached(raw_name, code)
+
+
+@functools.lru_cache(maxsize=2048)
+def _display_parts_cached(raw_name: str, code: str) -> tuple[str, str]:
+    """Memoized tail of get_course_display_parts.
+
+    friendly_course_name does balanced-paren parsing per call; the course
+    list renders every name on every rerun, so the result is cached on the
+    raw (name, code) inputs.
+    """
+    display_name = friendly_course_name(raw_name)
     # Canvas often appends the course name to the code field, e.g.
     # "BINTO1078U.LA_E25 (Introduction to Information Systems)"
     # Strip everything from the first '(' to keep only the code.
@@ -641,6 +668,35 @@ def render_download_wizard(container, current_step: int):
 
 # --- CBS Metadata Parser ---
 
+# Compiled once — these run per course name in the Step-1 filter loop.
+_CBS_TYPE_RE = re.compile(r'\b([LX])[A-Z]\b')
+_CBS_SEM_RE = re.compile(r'\b([EF])(\d{2})\b')
+
+
+@functools.lru_cache(maxsize=2048)
+def _parse_cbs_fields(raw_name: str) -> tuple:
+    """Memoized regex pass — returns (type, semester, year, year_full).
+
+    Cached on the raw name so Streamlit reruns re-filtering the same
+    ~100 course names hit a dict lookup instead of two regex searches.
+    Returns an immutable tuple so the cache can't be mutated by callers.
+    """
+    ctype = 'Other'
+    semester = year = year_full = None
+
+    type_match = _CBS_TYPE_RE.search(raw_name)
+    if type_match:
+        ctype = 'Lecture' if type_match.group(1) == 'L' else 'Exercise'
+
+    sem_match = _CBS_SEM_RE.search(raw_name)
+    if sem_match:
+        semester = 'Autumn' if sem_match.group(1) == 'E' else 'Spring'
+        year = sem_match.group(2)
+        year_full = f"20{year}"
+
+    return ctype, semester, year, year_full
+
+
 def parse_cbs_metadata(raw_name: str) -> dict:
     """Extract CBS-specific metadata from course name.
     
@@ -654,36 +710,13 @@ def parse_cbs_metadata(raw_name: str) -> dict:
     """
     if not raw_name:
         return {'type': 'Other', 'semester': None, 'year': None}
-        
-    meta = {
-        'type': 'Other', # Default to Other if no L/X found
-        'semester': None,
-        'year': None,
-        'year_full': None
+
+    ctype, semester, year, year_full = _parse_cbs_fields(raw_name)
+    return {
+        'type': ctype,
+        'semester': semester,
+        'year': year,
+        'year_full': year_full,
     }
-    
-    # Look for patterns in the whole string, but prioritized match
-    # Regex for Class Type: Word boundary, starts with L or X, followed by 1 uppercase letter
-    # We look for "LA", "XB", etc.
-    type_match = re.search(r'\b([LX])[A-Z]\b', raw_name)
-    if type_match:
-        code = type_match.group(1)
-        if code == 'L':
-            meta['type'] = 'Lecture'
-        elif code == 'X':
-            meta['type'] = 'Exercise'
-            
-    # Regex for Semester/Year: Word boundary, starts with E or F, followed by 2 digits
-    # E25 = Autumn 2025, F26 = Spring 2026
-    sem_match = re.search(r'\b([EF])(\d{2})\b', raw_name)
-    if sem_match:
-        sem_code = sem_match.group(1)
-        year_short = sem_match.group(2)
-        
-        meta['semester'] = 'Autumn' if sem_code == 'E' else 'Spring'
-        meta['year'] = year_short
-        meta['year_full'] = f"20{year_short}"
-        
-    return meta
 
 
@@ -10,6 +10,9 @@ import theme
 from preset_manager import PresetManager
 
 
+# Max lines of download_errors.txt shown per course in the error dialog
+MAX_ERRORS_PER_COURSE = 500
+
 # --- Entity Icons for secondary content logging ---
 SECONDARY_ENTITY_ICONS = {
     'assignment':   '📝',
@@ -179,14 +182,30 @@ def render_error_section(error_list: list, error_log_paths: list = None,
     if not error_list:
         return
 
+    # Single pass over the errors to bucket them by type — categorising with
+    # one comprehension per category would rescan the list for each bucket.
+    type_counts = {}
+    for err in error_list:
+        etype = getattr(err, 'error_type', None) or 'Other'
+        type_counts[etype] = type_counts.get(etype, 0) + 1
+
     st.markdown("<div style='margin-top: 10px;'></div>", unsafe_allow_html=True)
     with st.expander("📋 View Error Details", expanded=True):
+        if len(type_counts) > 1 or 'Other' not in type_counts:
+            summary = " · ".join(
+                f"{count}× {etype}" for etype, count in
+                sorted(type_counts.items(), key=lambda kv: kv[1], reverse=True))
+            st.caption(summary)
+        # One markdown element for the whole list — a call per error would
+        # push up to 20 separate deltas over the websocket.
+        lines = []
         for err in error_list[:20]:
             if hasattr(err, 'message'):
                 item_label = f"{err.item_name}: " if hasattr(err, 'item_name') and err.item_name else ""
-                st.markdown(f"❌ {item_label}{err.message}", unsafe_allow_html=True)
+                lines.append(f"❌ {item_label}{err.message}")
             else:
-                st.markdown(f"❌ {err}")
+                lines.append(f"❌ {err}")
+        st.markdown("<br>".join(lines), unsafe_allow_html=True)
         if len(error_list) > 20:
             st.caption(f"  ... and {len(error_list) - 20} more")
         st.caption('📄 Full error details are saved in `download_errors.txt` in each course folder.')
@@ -308,11 +327,25 @@ def error_log_dialog(log_paths):
         for log_path in log_paths:
             if log_path.exists():
                 try:
-                    content = log_path.read_text(encoding='utf-8').strip()
-                    if content:
+                    # Stream line-by-line with a hard cap — a course with
+                    # thousands of failures never materializes the whole
+                    # file in memory (or in the DOM).
+                    lines = []
+                    truncated = False
+                    with open(log_path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            line = line.rstrip()
+                            if line:
+                                lines.append(line)
+                                if len(lines) >= MAX_ERRORS_PER_COURSE:
+                                    truncated = True
+                                    break
+                    if lines:
                         found_any = True
                         st.markdown(f"**📁 {log_path.parent.name}**")
-                        st.code(content, language="text")
+                        st.code("\n".join(lines), language="text")
+                        if truncated:
+                            st.caption(f"Showing first {MAX_ERRORS_PER_COURSE} lines — open the file on disk for the full log.")
                 except Exception as e:
                     st.warning(f"Could not read {log_path}: {e}")
 